@@ -0,0 +1,317 @@
+# %%
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from dataclasses import replace
+from functools import partial
+from pathlib import Path
+from time import perf_counter
+
+import bd_gridfinity as gf
+import bd_utils as bdu
+import numpy as np
+from bd_gridfinity import baseplate
+from build123d import *
+
+# Time real builds, not BREP loads.
+bdu.part_cache.enabled = False
+
+
+def timed(fn, *args, **kwargs):
+    start = perf_counter()
+    result = fn(*args, **kwargs)
+    return result, perf_counter() - start
+
+
+# %%
+# Suite: time, peak memory and topology of every part, saved as JSON.
+# Compare two runs with `python -m bd_utils bench compare OLD.json NEW.json`.
+results = [
+    bdu.run_bench("BaseplateUnit", gf.BaseplateUnit),
+    bdu.run_bench("Dovetail", gf.Dovetail),
+    bdu.run_bench("BinBase", gf.BinBase),
+    *[
+        bdu.run_bench(f"Baseplate({n}, {n})", lambda: gf.Baseplate(n, n), repeat=1)
+        for n in [1, 2, 4, 6, 8]
+    ],
+    *[
+        bdu.run_bench(f"Bin({x}, {y}, {h})", lambda: gf.Bin(x, y, h), repeat=1)
+        for x, y, h in [(1, 1, 2), (1, 1, 6), (2, 2, 3), (3, 2, 6), (4, 4, 3)]
+    ],
+]
+print(bdu.save_results(results, Path("bench_results"), "gridfinity"))
+
+
+# %%
+# Instanced vs per-grid baseplate units, and batched vs nested dovetail cuts.
+# The instanced path pays for one BaseplateUnit per process, then only for
+# placement and a single glued fuse, so time per cell should stay flat.
+# Dovetails are cut with one compound tool instead of a fused sub-builder.
+_, template_time = timed(baseplate._unit_template, ())
+print(f"unit template: {template_time:.2f}s")
+
+
+def time_dovetails(plate: gf.Baseplate) -> float:
+    units = bdu.fuse_copies(
+        baseplate._unit_template(()), plate._unit_locations.locations
+    )
+    if plate.instanced:
+        _, elapsed = timed(lambda: units.cut(plate._dovetail_tool()).clean())
+        return elapsed
+
+    with BuildPart():
+        add(units, clean=False)
+        _, elapsed = timed(plate._cutout_dovetails)
+
+    return elapsed
+
+
+for n in [2, 4, 6, 8, 10, 12]:
+    instanced_plate, instanced = timed(gf.Baseplate, n, n)
+    rebuilt_plate, rebuilt = timed(gf.Baseplate, n, n, instanced=False)
+    print(
+        f"{n:>2}x{n:<2} instanced {instanced:6.2f}s ({instanced / n**2:.3f}s/cell)"
+        f"  rebuilt {rebuilt:6.2f}s ({rebuilt / n**2:.3f}s/cell)"
+        f"  dovetails batched {time_dovetails(instanced_plate):5.2f}s"
+        f" nested {time_dovetails(rebuilt_plate):5.2f}s"
+    )
+
+
+# %%
+# ShapeList vs vectorized selectors on a large plate. The fast selectors pay
+# for extracting centers once, then repeated selections are array operations.
+plate = gf.Baseplate(8, 8)
+for label, select in [
+    ("ShapeList", lambda: plate.edges().filter_by(Axis.X).group_by(Axis.Z)),
+    ("FastShapeList", lambda: bdu.fast_edges(plate).filter_by(Axis.X).group_by(Axis.Z)),
+]:
+    _, first = timed(select)
+    _, repeat = timed(select)
+    print(f"{label:<14} first {first:.3f}s  repeat {repeat:.3f}s")
+
+
+# %%
+# Lazy specs answer size, volume and fit analytically. Check them against
+# the built part.
+for spec in [gf.BinSpec(1, 1, 3), gf.BinSpec(3, 2, 6), gf.BaseplateSpec(4, 3)]:
+    (size, volume), estimate = timed(lambda: (spec.size, spec.volume))
+    part, built = timed(lambda: spec.part)
+    size_error = max(abs(a - b) for a, b in zip(size, part.bounding_box().size))
+    print(
+        f"{spec.name:<16} estimate {estimate * 1e6:6.1f}us  build {built:6.2f}s"
+        f"  size error {size_error:.1e}"
+        f"  volume error {abs(volume / part.volume - 1):.3%}"
+    )
+
+
+# %%
+# Cold imports, as paid by every process-pool worker. Nothing here should load
+# the viewer; build123d itself is the floor.
+for module in ["build123d", "bd_utils", "bd_gridfinity"]:
+    bdu.measure_import(module)
+
+
+# %%
+# Instanced 3MF export against meshing and writing every part whole.
+plate = [gf.BaseplateSpec(5, 4)] + [
+    (gf.BinSpec(1, 1, 3), Pos(x * gf.grid_unit, 200)) for x in range(5)
+]
+_, instanced = timed(gf.export_3mf, "export/bench_instanced.3mf", plate)
+
+
+def export_flat(path: str) -> None:
+    with bdu.ThreeMFWriter(path) as writer:
+        for item in plate:
+            spec, location = item if isinstance(item, tuple) else (item, Location())
+            writer.add_item(writer.add_mesh(bdu.tessellate(spec.part)), location)
+
+
+_, flat = timed(export_flat, "export/bench_flat.3mf")
+for label, seconds in [("instanced", instanced), ("flat", flat)]:
+    size = Path(f"export/bench_{label}.3mf").stat().st_size / 1024**2
+    print(f"{label:<10} {seconds:6.2f}s {size:7.1f} MiB")
+
+
+# %%
+# Plate meshes assembled from per-cell tessellations against tessellating the
+# fused plate. tests/test_mesh.py checks they match.
+for n in [2, 4, 6]:
+    spec = gf.BaseplateSpec(n, n)
+    _, assemble_time = timed(spec.mesh)
+    _, exact_time = timed(lambda: bdu.tessellate(spec.part))
+    print(f"{n:>2}x{n:<2} assembled {assemble_time:6.2f}s  exact {exact_time:6.2f}s")
+
+
+# %%
+# OCC-free preview meshes against building the parts. tests/test_preview.py
+# checks their sizes and volumes against the builds.
+for name, preview, build in [
+    ("BaseplateUnit", gf.baseplate_unit_mesh, gf.BaseplateUnit),
+    ("BinBase", gf.bin_base_mesh, gf.BinBase),
+    ("lip 2x1", lambda: gf.lip_mesh(2, 1), lambda: gf.BinShell(2, 1, 3)),
+]:
+    _, elapsed = timed(preview)
+    _, build_time = timed(build)
+    print(f"{name:<14} preview {elapsed * 1000:6.1f}ms  build {build_time:6.2f}s")
+
+# %%
+# Incremental show: re-showing rebuilt but unchanged parts only hashes them,
+# and only changed parts are tessellated again. A stub viewer stands in for
+# ocp_vscode and tessellates what it would send.
+class StubViewer:
+    def __init__(self):
+        self.stack: list = []
+
+    def reset_show(self):
+        self.stack = []
+
+    def push_object(self, obj, name=None):
+        self.stack.append(obj)
+
+    def show_objects(self):
+        for obj in self.stack:
+            obj.tessellate(0.01, 0.1)
+
+    def show_clear(self):
+        pass
+
+
+viewer = StubViewer()
+session = bdu.ShowSession(viewer)
+for run, (x, height) in enumerate([(4, 3), (4, 3), (4, 6)]):
+    parts = {"plate": gf.Baseplate(x, x), "bin": gf.Bin(2, 1, height)}
+    diff, elapsed = timed(session.show, parts)
+    print(f"run {run}: {elapsed:6.2f}s  changed {diff.added + diff.changed}")
+
+# %%
+# Stage cache: after a magnet tolerance change only the magnet hole stages
+# replay. The stages before them are loaded from a scratch part cache.
+bdu.part_cache.path = Path(tempfile.mkdtemp())
+bdu.part_cache.enabled = True
+tolerance = gf.magnet_tolerance
+for name, build in [("BaseplateUnit", gf.BaseplateUnit), ("BinBase", gf.BinBase)]:
+    _, cold = timed(build)
+    baseplate.magnet_tolerance = gf.bin.magnet_tolerance = tolerance + 0.1 * MM
+    part, replayed = timed(build)
+    baseplate.magnet_tolerance = gf.bin.magnet_tolerance = tolerance
+    _, rebuilt = timed(build)
+    print(
+        f"{name:<14} cold {cold:.2f}s  magnet change {replayed:.2f}s"
+        f"  unchanged {rebuilt:.2f}s  volume {part.volume:.1f}"
+    )
+bdu.part_cache.enabled = False
+
+# %%
+# Lip modes: the stepped lip cuts one ruled loft through the `lip_steps`
+# sections instead of sweeping the profile. The shapes are identical, see
+# tests/test_bin.py, and sweeping is faster.
+for x, y in [(1, 1), (4, 3), (8, 8)]:
+    _, sweep_time = timed(gf.BinShell, x, y, 3, lip="sweep")
+    _, stepped_time = timed(gf.BinShell, x, y, 3, lip="stepped")
+    print(f"{x}x{y}  sweep {sweep_time:.2f}s  stepped {stepped_time:.2f}s")
+
+# %%
+# Base grid memo: a height sweep builds the feet of a 2x3 bin once, then only
+# the shell and lip per height. Clearing the memo before each build times the
+# old path, where every height rebuilt and fused its own feet.
+heights = range(2, 9)
+for label, clear in [("rebuilt feet", True), ("memoized feet", False)]:
+    gf.bin._base_grid.cache_clear()
+    start = perf_counter()
+    for h in heights:
+        if clear:
+            gf.bin._base_grid.cache_clear()
+        gf.Bin(2, 3, h)
+    elapsed = perf_counter() - start
+    print(f"{label:<14} {elapsed:6.2f}s  ({elapsed / len(heights):.2f}s/height)")
+
+# %%
+# Boolean options on large plates. Parallel booleans only pay off with cores
+# to spare, so compare against serial ones on the machine at hand. Every
+# option should leave the plate's volume and faces unchanged.
+print(f"{os.cpu_count()} cores")
+for n in [6, 10]:
+    for label, options in [
+        ("serial", dict(parallel=False)),
+        ("parallel", dict(parallel=True)),
+        ("fuzzy", dict(fuzzy=1e-5)),
+        ("no heal", dict(heal=False)),
+    ]:
+        with bdu.build_options(**options):
+            instanced_plate, instanced = timed(gf.Baseplate, n, n)
+            rebuilt_plate, rebuilt = timed(gf.Baseplate, n, n, instanced=False)
+        print(
+            f"{n:>2}x{n:<2} {label:<9} instanced {instanced:6.2f}s"
+            f"  rebuilt {rebuilt:6.2f}s  volume {instanced_plate.volume:.1f}"
+            f" / {rebuilt_plate.volume:.1f}  faces {len(instanced_plate.faces())}"
+        )
+
+# %%
+# Print-bed packing from lazy dimensions, nothing is built. Hundreds of parts
+# should pack in well under a second.
+rng = np.random.default_rng(0)
+catalog = [
+    gf.BinSpec(int(x), int(y), int(h))
+    for x, y, h in rng.integers([1, 1, 2], [4, 4, 7], size=(400, 3))
+] + [gf.BaseplateSpec(int(x), int(y)) for x, y in rng.integers(1, 6, size=(100, 2))]
+for count in [50, 200, 500]:
+    beds, elapsed = timed(gf.pack_beds, catalog[-count:])
+    utilization = [bed.utilization for bed in beds]
+    print(
+        f"{count:>3} parts {elapsed * 1000:6.1f}ms  {len(beds):>3} beds"
+        f"  utilization mean {np.mean(utilization):.1%} min {min(utilization):.1%}"
+    )
+
+# One assembled plate per bed, as a single 3MF each.
+for index, bed in enumerate(gf.pack_beds(catalog[-12:])):
+    gf.export_3mf(f"export/bench_bed_{index}.3mf", bed.items)
+
+# %%
+# Incremental export: the second run skips every part from its manifest, and
+# a source change that leaves the geometry alone rebuilds without rewriting.
+out_dir = Path(tempfile.mkdtemp())
+jobs = [
+    bdu.ExportJob(
+        (f"bin_2x2x{h}.step",),
+        partial(gf.Bin, 2, 2, h),
+        ("Bin", 2, 2, h, gf.bin._source),
+    )
+    for h in [2, 3, 4, 5]
+]
+edited = [replace(job, inputs=(*job.inputs, "edited")) for job in jobs]
+for label, run in [("cold", jobs), ("unchanged", jobs), ("source edit", edited)]:
+    exports, elapsed = timed(bdu.export_parts, run, out_dir)
+    print(f"{label:<12} {elapsed:6.2f}s  {[export.status for export in exports]}")
+
+# %%
+# Compact builds on large plates, each in a fresh process so peak memory is
+# its own. Compact mode fuses the plate a row at a time and frees each stage,
+# so its peak should be lower. tests/test_baseplate.py checks the plates match.
+code = """
+import json, sys
+import bd_gridfinity as gf, bd_utils as bdu
+n, compact = int(sys.argv[1]), sys.argv[2] == "1"
+with bdu.build_options(compact=compact):
+    with bdu.profile_memory(print_summary=False) as profile:
+        plate = gf.Baseplate(n, n)
+stages = {sample.stage: sample.rss_mb for sample in profile.samples}
+seconds = profile.samples[-1].seconds
+print(json.dumps([seconds, bdu.peak_rss_mb(), stages]))
+"""
+for n in [6, 10]:
+    for compact in [False, True]:
+        seconds, peak, stages = json.loads(
+            subprocess.run(
+                [sys.executable, "-c", code, str(n), str(int(compact))],
+                capture_output=True,
+                check=True,
+                text=True,
+                env={**os.environ, "BD_CACHE": "0"},
+            ).stdout
+        )
+        print(
+            f"{n:>2}x{n:<2} {'compact' if compact else 'default':<8} {seconds:6.2f}s"
+            f"  peak {peak:6.1f} MiB  after units {stages['Baseplate.units']:6.1f}"
+        )
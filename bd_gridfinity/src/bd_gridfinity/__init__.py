@@ -1,2 +1,7 @@
 from bd_gridfinity.baseplate import *
 from bd_gridfinity.bin import *
+from bd_gridfinity.export import *
+from bd_gridfinity.lazy import *
+from bd_gridfinity.packing import *
+from bd_gridfinity.preview import *
+from bd_gridfinity.tiling import *
@@ -0,0 +1,3 @@
+from bd_gridfinity.catalog import main
+
+main()
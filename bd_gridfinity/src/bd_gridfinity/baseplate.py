@@ -1,8 +1,11 @@
-from ocp_vscode import *
+import sys
+from functools import cache
+from typing import Iterable, Literal, TypeAlias
 
 import bd_utils as bdu
 from build123d import *
 
+from . import spec
 from .spec import *
 
 height = 7.2 * MM
@@ -23,6 +26,18 @@ inner_wall_corner = bdu.vec2(grid_unit / 2 - wall_width)
 
 magnet_pad_size = 9.6 * MM
 
+DovetailSide: TypeAlias = Literal["-x", "+x", "-y", "+y"]
+all_dovetail_sides: tuple[DovetailSide, ...] = ("-x", "+x", "-y", "+y")
+
+_source = bdu.source_fingerprint(sys.modules[__name__], spec)
+magnet_hole_inputs = (
+    "magnet_center",
+    "magnet_diameter",
+    "magnet_tolerance",
+    "magnet_thickness",
+    "magnet_hole_fillet",
+)
+
 
 class BaseplateUnit(BasePartObject):
     def __init__(
@@ -30,7 +45,35 @@ class BaseplateUnit(BasePartObject):
         align: bdu.Align3Input | None = '**-',
     ):
         super().__init__(
-            self._build(),
+            bdu.build_stages(
+                [
+                    bdu.Stage("box", self._add_box, ("grid_unit", "height")),
+                    bdu.Stage(
+                        "walls",
+                        self._cut_walls,
+                        ("grid_unit", "corner_radius", "wall_height_steps"),
+                        (BaseplateUnit._main_work_face,),
+                    ),
+                    bdu.Stage(
+                        "plate",
+                        self._cut_plate,
+                        (
+                            "lip_width",
+                            "inner_wall_corner",
+                            "magnet_pad_size",
+                            "corner_radius",
+                        ),
+                        (BaseplateUnit._main_work_face,),
+                    ),
+                    bdu.Stage(
+                        "magnet_holes",
+                        self._cut_magnet_holes,
+                        magnet_hole_inputs,
+                        (BaseplateUnit._main_work_face,),
+                    ),
+                ],
+                type(self).__qualname__,
+            ),
             align=bdu.align3(align),  # type: ignore
         )
 
@@ -38,20 +81,13 @@ class BaseplateUnit(BasePartObject):
     def _main_work_face(self) -> Face:
         return bdu.axis_face_groups(Axis.Z)[1][0]
 
-    def _build(self) -> Part:
-        with BuildPart() as builder:
-            Box(
-                length=grid_unit,
-                width=grid_unit,
-                height=height,
-                align=bdu.align3("***"),
-            )
-
-            self._cut_walls()
-            self._cut_plate()
-            self._cut_magnet_holes()
-
-        return builder.part
+    def _add_box(self):
+        Box(
+            length=grid_unit,
+            width=grid_unit,
+            height=height,
+            align=bdu.align3("***"),
+        )
 
     def _cut_walls(self):
         with BuildSketch(self._main_work_face) as perimiter:
@@ -86,7 +122,7 @@ class BaseplateUnit(BasePartObject):
                         align=bdu.align2("++"),
                     )
 
-                [inner_corner, *_] = pads.vertices().sort_by_distance((0, 0))
+                [inner_corner, *_] = bdu.fast_vertices(pads).sort_by_distance((0, 0))
                 fillet(inner_corner, radius=corner_radius)
 
                 mirror(about=Plane.XZ)
@@ -114,7 +150,7 @@ class BaseplateUnit(BasePartObject):
             mirror(about=Plane.XZ)
             mirror(about=Plane.YZ)
 
-        top_edges = holes.edges().group_by(Axis.Z)[-1]
+        top_edges = bdu.fast_edges(holes).group_by(Axis.Z)[-1]
         fillet(top_edges, magnet_hole_fillet)  # type: ignore
 
 
@@ -124,48 +160,167 @@ class Baseplate(BasePartObject):
         x_units: int,
         y_units: int,
         align: bdu.Align3Input | None = '**-',
+        instanced: bool = True,
+        dovetail_sides: Iterable[DovetailSide] = all_dovetail_sides,
     ):
         self.x_units = x_units
         self.y_units = y_units
+        self.instanced = instanced
+        self.dovetail_sides = tuple(
+            side for side in all_dovetail_sides if side in set(dovetail_sides)
+        )
 
-        super().__init__(
-            self._build(),
-            align=bdu.align3(align),  # type: ignore
+        part = bdu.cached_part(
+            self._build,
+            type(self).__qualname__,
+            x_units,
+            y_units,
+            self.dovetail_sides,
+            _source,
+        )
+        if bdu.current_options().compact:
+            # The plate's bounds are known, so measuring it is waste
+            part = bdu.prealigned(part, bdu.align3(align), self._bounds)
+            align = None
+
+        super().__init__(part, align=bdu.align3(align))  # type: ignore
+        bdu.commit_stage("Baseplate.align")
+
+    @property
+    def _bounds(self) -> tuple[Vector, Vector]:
+        half = Vector(self.x_units * grid_unit / 2, self.y_units * grid_unit / 2)
+        return Vector(-half.X, -half.Y, 0), Vector(half.X, half.Y, height)
+
+    @property
+    def _unit_locations(self) -> GridLocations:
+        return GridLocations(
+            x_spacing=grid_unit,
+            y_spacing=grid_unit,
+            x_count=self.x_units,
+            y_count=self.y_units,
         )
 
     def _build(self) -> Part:
+        if self.instanced:
+            return self._build_instanced()
+
         with BuildPart() as builder:
-            with GridLocations(
-                x_spacing=grid_unit,
-                y_spacing=grid_unit,
-                x_count=self.x_units,
-                y_count=self.y_units,
-            ):
+            with self._unit_locations:
                 BaseplateUnit()
+            bdu.commit_stage("Baseplate.units")
 
             self._cutout_dovetails()
 
+        bdu.commit_stage("Baseplate.dovetails")
         return builder.part
 
+    def _build_instanced(self) -> Part:
+        locations = bdu.grid_locations(grid_unit, grid_unit, self.x_units, self.y_units)
+        options = bdu.current_options()
+        units = bdu.fuse_copies(
+            _unit_template(options.cache_inputs),
+            locations,
+            batch=self.y_units if options.compact else None,
+        )
+        bdu.commit_stage("Baseplate.units")
+        if not self.dovetail_sides:
+            return bdu.as_part(units)
+
+        plate = units.cut(self._dovetail_tool()).clean()
+        del units
+        bdu.commit_stage("Baseplate.dovetails")
+        return bdu.as_part(plate)
+
     def _cutout_dovetails(self) -> None:
+        if not self.dovetail_sides:
+            return
+
         parent = BuildPart._get_context()
         with BuildPart(mode=Mode.SUBTRACT) as dovetails:
             dovetails.builder_parent = parent
 
-            with GridLocations(
-                grid_unit,
-                (grid_unit * self.y_units),
-                x_count=self.x_units,
-                y_count=2,
-            ):
-                Dovetail()
-            with GridLocations(
-                (grid_unit * self.x_units),
-                grid_unit,
-                x_count=2,
-                y_count=self.y_units,
-            ):
-                Dovetail(rotation=(0, 0, 90))
+            for side in self.dovetail_sides:
+                with Locations(*_dovetail_locations(side, self.x_units, self.y_units)):
+                    Dovetail(rotation=_dovetail_rotation(side))
+
+    def _dovetail_tool(self) -> Compound:
+        return Compound.make_compound(
+            [
+                solid
+                for side in self.dovetail_sides
+                for solid in bdu.place_copies(
+                    _dovetail_template(
+                        _dovetail_rotation(side), bdu.current_options().cache_inputs
+                    ),
+                    _dovetail_locations(side, self.x_units, self.y_units),
+                )
+            ]
+        )
+
+
+def _dovetail_locations(
+    side: DovetailSide, x_units: int, y_units: int
+) -> list[Location]:
+    sign = -1 if side[0] == "-" else 1
+    if side[1] == "y":
+        offset = Pos(0, sign * grid_unit * y_units / 2)
+        edge = bdu.grid_locations(grid_unit, 0, x_units, 1)
+    else:
+        offset = Pos(sign * grid_unit * x_units / 2, 0)
+        edge = bdu.grid_locations(0, grid_unit, 1, y_units)
+
+    return [offset * location for location in edge]
+
+
+def _dovetail_rotation(side: DovetailSide) -> tuple[float, float, float]:
+    return (0, 0, 90) if side[1] == "x" else (0, 0, 0)
+
+
+@cache
+def _unit_template(cache_inputs: tuple) -> Part:
+    """A single `BaseplateUnit`, built once per process and shared by all plates.
+
+    `cache_inputs` are those of the build options it was built with.
+    """
+    with BuildPart() as unit:
+        BaseplateUnit()
+
+    return unit.part
+
+
+@cache
+def _cell_template(
+    dovetail_sides: tuple[DovetailSide, ...], cache_inputs: tuple
+) -> Part:
+    """A `BaseplateUnit` with dovetails cut into the given edges.
+
+    Every cell of a plate is one of these, so exporters can share one mesh per
+    edge combination instead of meshing the fused plate.
+    """
+    if not dovetail_sides:
+        return _unit_template(cache_inputs)
+
+    tool = Compound.make_compound(
+        [
+            solid
+            for side in dovetail_sides
+            for solid in bdu.place_copies(
+                _dovetail_template(_dovetail_rotation(side), cache_inputs),
+                _dovetail_locations(side, 1, 1),
+            )
+        ]
+    )
+    return bdu.as_part(_unit_template(cache_inputs).cut(tool).clean())
+
+
+@cache
+def _dovetail_template(
+    rotation: tuple[float, float, float], cache_inputs: tuple
+) -> Part:
+    with BuildPart() as dovetail:
+        Dovetail(rotation=rotation)
+
+    return dovetail.part
 
 
 class Dovetail(BasePartObject):
@@ -181,7 +336,7 @@ class Dovetail(BasePartObject):
         self._angle = 70
 
         super().__init__(
-            self._build(),
+            bdu.cached_part(self._build, type(self).__qualname__, _source),
             rotation=rotation,
             align=bdu.align3(align),  # type: ignore
             mode=mode,
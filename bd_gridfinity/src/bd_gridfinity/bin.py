@@ -1,11 +1,12 @@
-from turtle import width
-
-from ocp_vscode import *
+import math
+import sys
+from functools import cache
+from typing import Literal, TypeAlias
 
 import bd_utils as bdu
 from build123d import *
 
-from . import baseplate
+from . import baseplate, spec
 from .spec import *
 
 tolerance_gap = 0.25 * MM
@@ -33,6 +34,13 @@ lip_height = sum([height for [height, taper] in lip_steps])
 lip_radius = 0.5 * MM
 wall_width = sum([height for [height, taper] in lip_steps if taper == 45])
 
+# "sweep" sweeps the lip profile around the rim. "stepped" cuts the inside of
+# the lip with a ruled loft through `lip_steps`. Both give the same shape, and
+# sweeping is the faster of the two.
+LipMode: TypeAlias = Literal["sweep", "stepped"]
+
+_source = bdu.source_fingerprint(sys.modules[__name__], baseplate, spec)
+
 
 class Bin(BasePartObject):
     def __init__(
@@ -41,103 +49,225 @@ class Bin(BasePartObject):
         y_units: int = 1,
         height_units: int = 3,
         align: bdu.Align3Input | None = "**-",
+        lip: LipMode = "sweep",
     ):
         self.x_units = x_units
         self.y_units = y_units
         self.height_units = height_units
         self.body_height = height_units * height_unit - base_height
+        self.lip = lip
 
         super().__init__(
-            self._build(),
+            bdu.cached_part(
+                self._build,
+                type(self).__qualname__,
+                x_units,
+                y_units,
+                height_units,
+                lip,
+                _source,
+            ),
             align=bdu.align3(align),  # type: ignore
         )
 
-    @property
-    def _top_face(self) -> Face:
-        return bdu.axis_faces(Axis.Z)[-1]
-
     def _build(self) -> Part:
         with BuildPart() as builder:
-            with GridLocations(
-                x_spacing=grid_unit,
-                y_spacing=grid_unit,
-                x_count=self.x_units,
-                y_count=self.y_units,
-            ):
-                BinBase(align="**+")
-
-            with BuildPart() as body:
-                with BuildSketch() as walls:
-                    RectangleRounded(
-                        width=self._get_body_size(self.x_units),
-                        height=self._get_body_size(self.y_units),
-                        radius=corner_radius,
-                    )
-
-                extrude(amount=self.body_height)
-                offset(amount=-wall_width, openings=self._top_face)
-
-            top_face = self._top_face
-            with BuildSketch(
-                Plane(origin=top_face.edges()[0] @ 0, x_dir=(1, 0, 0), z_dir=(0, -1, 0))
-            ) as lip:
-                with BuildLine() as lip_line:
-                    l1 = Line((0, 0), (0, 4.4))
-                    l2 = PolarLine(l1 @ 1, 1.9, -45, length_mode=LengthMode.HORIZONTAL)
-                    l3 = PolarLine(l2 @ 1, -1.8, 90)
-                    l4 = PolarLine(l3 @ 1, 0.7, -45, length_mode=LengthMode.HORIZONTAL)
-                    l5 = Line(l4 @ 1, l1 @ 0)
-
-                make_face()
-                fillet(lip.vertices().sort_by(Axis.Y)[-1], lip_radius)
-
-            sweep(path=top_face.outer_wire())
-
-            # face = self._top_face
-            # with BuildSketch(face) as lip:
-            #     add(face)
-
-            # extrude(amount=lip_steps[0][0], taper=lip_steps[0][1])
+            add(
+                _base_grid(
+                    self.x_units,
+                    self.y_units,
+                    _source,
+                    bdu.current_options().cache_inputs,
+                )
+            )
+            BinShell(self.x_units, self.y_units, self.height_units, lip=self.lip)
 
         return builder.part
 
-    def _get_body_size(self, units: int) -> float:
-        return units * size + ((units - 1) * tolerance_gap * 2)
 
+@cache
+def _base_grid(
+    x_units: int, y_units: int, source: str, cache_inputs: tuple
+) -> Part:
+    """The grid of `BinBase` feet under a bin, built once per process for every
+    height. `source` is the fingerprint of the spec the feet were built from,
+    and `cache_inputs` are those of the build options.
+    """
+    with BuildPart() as foot:
+        BinBase(align="**+")
+
+    locations = bdu.grid_locations(grid_unit, grid_unit, x_units, y_units)
+    return bdu.as_part(bdu.fuse_copies(foot.part, locations))
+
+
+class BinShell(BasePartObject):
+    """The walls and lip of a `Bin`, standing on its grid of `BinBase` feet."""
 
-class BinBase(BasePartObject):
     def __init__(
         self,
+        x_units: int = 1,
+        y_units: int = 1,
+        height_units: int = 3,
         align: bdu.Align3Input | None = "**-",
+        lip: LipMode = "sweep",
     ):
+        self.x_units = x_units
+        self.y_units = y_units
+        self.height_units = height_units
+        self.body_height = height_units * height_unit - base_height
+        self.lip = lip
+
+        lip_stage = {
+            "sweep": bdu.Stage(
+                "lip", self._add_lip, ("lip_radius",), (BinShell._top_face,)
+            ),
+            "stepped": bdu.Stage(
+                "stepped_lip",
+                self._add_stepped_lip,
+                (
+                    "lip_steps",
+                    "lip_height",
+                    "lip_radius",
+                    "wall_width",
+                    "corner_radius",
+                    "size",
+                    "tolerance_gap",
+                ),
+                (BinShell._get_body_size,),
+            ),
+        }[lip]
+
         super().__init__(
-            self._build(),
+            bdu.build_stages(
+                [
+                    bdu.Stage(
+                        "walls",
+                        self._add_walls,
+                        ("size", "tolerance_gap", "corner_radius", "wall_width"),
+                        (BinShell._top_face, BinShell._get_body_size),
+                    ),
+                    lip_stage,
+                ],
+                type(self).__qualname__,
+                x_units,
+                y_units,
+                height_units,
+                height_unit,
+                base_height,
+            ),
             align=bdu.align3(align),  # type: ignore
         )
 
-    def _build(self) -> Part:
-        with BuildPart() as builder:
-            with BuildSketch() as perimiter:
+    @property
+    def _top_face(self) -> Face:
+        return bdu.axis_faces(Axis.Z)[-1]
+
+    def _add_walls(self):
+        with BuildSketch() as walls:
+            RectangleRounded(
+                width=self._get_body_size(self.x_units),
+                height=self._get_body_size(self.y_units),
+                radius=corner_radius,
+            )
+
+        extrude(walls.sketch, amount=self.body_height)
+        offset(amount=-wall_width, openings=self._top_face)
+
+    def _add_lip(self):
+        top_face = self._top_face
+        with BuildSketch(
+            Plane(origin=top_face.edges()[0] @ 0, x_dir=(1, 0, 0), z_dir=(0, -1, 0))
+        ) as lip:
+            with BuildLine() as lip_line:
+                l1 = Line((0, 0), (0, 4.4))
+                l2 = PolarLine(l1 @ 1, 1.9, -45, length_mode=LengthMode.HORIZONTAL)
+                l3 = PolarLine(l2 @ 1, -1.8, 90)
+                l4 = PolarLine(l3 @ 1, 0.7, -45, length_mode=LengthMode.HORIZONTAL)
+                l5 = Line(l4 @ 1, l1 @ 0)
+
+            make_face()
+            fillet(bdu.fast_vertices(lip).sort_by(Axis.Y)[-1], lip_radius)
+
+        sweep(lip.sketch, path=top_face.outer_wire())
+
+    def _add_stepped_lip(self):
+        width = self._get_body_size(self.x_units)
+        length = self._get_body_size(self.y_units)
+
+        with BuildSketch(Plane.XY.offset(self.body_height)) as outline:
+            RectangleRounded(width, length, corner_radius)
+        extrude(outline.sketch, amount=lip_height)
+
+        # The opening widens upward through each step. The last one runs past
+        # the outside of the lip, so the rim is a clean edge, not a sliver.
+        z = self.body_height
+        inset = wall_width
+        levels = [(z, inset)]
+        for index, [amount, taper] in enumerate(lip_steps):
+            if index == len(lip_steps) - 1:
+                amount *= 2
+            z += amount
+            inset -= amount * math.tan(math.radians(taper))
+            levels.append((z, inset))
+
+        sections = []
+        for z, inset in levels:
+            with BuildSketch(Plane.XY.offset(z)) as section:
                 RectangleRounded(
-                    width=size,
-                    height=size,
-                    radius=corner_radius,
+                    width - 2 * inset, length - 2 * inset, corner_radius - inset
                 )
+            sections.append(section.sketch)
+        loft(sections, ruled=True, mode=Mode.SUBTRACT)
 
-            is_first = True
-            for [amount, taper] in base_height_steps:
-                to_extrude = perimiter.sketch if is_first else bdu.axis_faces(Axis.Z)[0]
-                extrude(
-                    to_extrude,
-                    amount=amount,
-                    taper=taper,
-                    dir=bdu.Dir.DOWN,
-                )
-                is_first = False
+        rim_edges = bdu.fast_edges(BuildPart._get_context()).group_by(Axis.Z)[-1]
+        fillet(rim_edges, lip_radius)  # type: ignore
+
+    def _get_body_size(self, units: int) -> float:
+        return units * size + ((units - 1) * tolerance_gap * 2)
 
-            self._cut_magnet_holes()
 
-        return builder.part
+class BinBase(BasePartObject):
+    def __init__(
+        self,
+        align: bdu.Align3Input | None = "**-",
+    ):
+        super().__init__(
+            bdu.build_stages(
+                [
+                    bdu.Stage(
+                        "steps",
+                        self._add_steps,
+                        ("size", "corner_radius", "base_height_steps"),
+                    ),
+                    bdu.Stage(
+                        "magnet_holes",
+                        self._cut_magnet_holes,
+                        baseplate.magnet_hole_inputs,
+                    ),
+                ],
+                type(self).__qualname__,
+            ),
+            align=bdu.align3(align),  # type: ignore
+        )
+
+    def _add_steps(self):
+        with BuildSketch() as perimiter:
+            RectangleRounded(
+                width=size,
+                height=size,
+                radius=corner_radius,
+            )
+
+        is_first = True
+        for [amount, taper] in base_height_steps:
+            to_extrude = perimiter.sketch if is_first else bdu.axis_faces(Axis.Z)[0]
+            extrude(
+                to_extrude,
+                amount=amount,
+                taper=taper,
+                dir=bdu.Dir.DOWN,
+            )
+            is_first = False
 
     def _cut_magnet_holes(self):
         face = bdu.axis_faces(Axis.Z)[0]
@@ -148,11 +278,13 @@ class BinBase(BasePartObject):
             mirror(about=Plane.XZ)
             mirror(about=Plane.YZ)
 
-        edges = extrude(
-            holes.sketch,
-            amount=magnet_thickness,
-            dir=bdu.Dir.UP,
-            mode=Mode.SUBTRACT,
-        ).edges()
+        edges = bdu.fast_edges(
+            extrude(
+                holes.sketch,
+                amount=magnet_thickness,
+                dir=bdu.Dir.UP,
+                mode=Mode.SUBTRACT,
+            )
+        )
         bottom_edges = edges.group_by(Axis.Z)[0]
         fillet(bottom_edges, magnet_hole_fillet)  # type: ignore
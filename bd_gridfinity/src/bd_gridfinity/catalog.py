@@ -0,0 +1,215 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from itertools import product
+from multiprocessing import get_context
+from pathlib import Path
+from time import perf_counter
+from typing import Literal
+
+CatalogKind = Literal["bin", "baseplate"]
+ExportFormat = Literal["step", "stl"]
+
+exports_manifest = "exports.json"
+
+
+@dataclass(frozen=True)
+class CatalogItem:
+    kind: CatalogKind
+    units: tuple[int, ...]
+
+    @property
+    def name(self) -> str:
+        return f"{self.kind}_{'x'.join(map(str, self.units))}"
+
+
+@dataclass
+class CatalogResult:
+    name: str
+    kind: CatalogKind
+    units: tuple[int, ...]
+    files: list[str] = field(default_factory=list)
+    written: list[str] = field(default_factory=list)
+    """Files rewritten this run. Parts built from unchanged inputs are skipped."""
+    seconds: float = 0
+    rss_mb: float = 0
+    """Peak resident memory while building the part, above what the worker
+    already held. Workers keep memory from earlier parts, so their lifetime peak
+    would mostly measure those."""
+    error: str | None = None
+    export: dict | None = None
+    """The `bd_utils.ExportEntry` of the files, as a dict."""
+
+
+def parse_units(value: str) -> list[int]:
+    """Parse `2`, `1-4` or `1,2,4` into a list of unit counts."""
+    units = []
+    for part in value.split(","):
+        start, _, end = part.partition("-")
+        units.extend(range(int(start), int(end or start) + 1))
+
+    return units
+
+
+def parse_matrix(value: str, dims: int) -> list[tuple[int, ...]]:
+    """Parse a size matrix such as `1-4x1-4x2-6` into every combination."""
+    axes = value.split("x")
+    if len(axes) != dims:
+        raise argparse.ArgumentTypeError(f"Expected {dims} sizes in {value}")
+
+    return list(product(*map(parse_units, axes)))
+
+
+def build_item(
+    item: CatalogItem, out_dir: Path, formats: list[ExportFormat]
+) -> CatalogResult:
+    """Build and export one catalog item, unless its files in `out_dir` are
+    current. Runs inside a pool worker."""
+    # Imported here so only the workers pay for loading OCC
+    import bd_gridfinity as gf
+    import bd_utils as bdu
+
+    result = CatalogResult(name=item.name, kind=item.kind, units=item.units)
+    start = perf_counter()
+    start_rss = bdu.rss_bytes()
+    with bdu.RssSampler() as sampler:
+        try:
+            match item.kind:
+                case "bin":
+                    build, source = partial(gf.Bin, *item.units), gf.bin._source
+                case "baseplate":
+                    build = partial(gf.Baseplate, *item.units)
+                    source = gf.baseplate._source
+
+            result.files = [f"{item.name}.{export_format}" for export_format in formats]
+            _, entry, result.written = bdu.export_part(
+                build,
+                out_dir,
+                result.files,
+                bdu.PartCache.key(item, source),
+                bdu.read_manifest(out_dir / exports_manifest),
+            )
+            result.export = asdict(entry)
+        except Exception as error:
+            result.error = repr(error)
+
+    result.seconds = perf_counter() - start
+    result.rss_mb = (sampler.peak - start_rss) / 1024**2
+
+    return result
+
+
+def build_catalog(
+    items: list[CatalogItem],
+    out_dir: Path,
+    formats: list[ExportFormat],
+    workers: int | None = None,
+) -> list[CatalogResult]:
+    """Build `items` across a process pool, one OCC kernel per worker."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=get_context("spawn"),
+    ) as pool:
+        futures = [pool.submit(build_item, item, out_dir, formats) for item in items]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            _print_result(result)
+
+    results.sort(key=lambda result: (result.kind, result.units))
+    manifest = [asdict(result) for result in results]
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=2))
+    _update_exports(out_dir / exports_manifest, results)
+
+    return results
+
+
+def _update_exports(path: Path, results: list[CatalogResult]) -> None:
+    """Record the hashes of every exported file, in the format of
+    `bd_utils.read_manifest`, without loading OCC here."""
+    entries = json.loads(path.read_text()) if path.exists() else {}
+    for result in results:
+        if result.export is not None:
+            entries.update({file: result.export for file in result.files})
+
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(entries, indent=2))
+    os.replace(tmp_path, path)
+
+
+def _print_result(result: CatalogResult) -> None:
+    if result.error:
+        status = f"FAILED {result.error}"
+    elif result.written:
+        status = ", ".join(result.written)
+    else:
+        status = "unchanged"
+    print(
+        f"{result.name:<18} {result.seconds:7.2f}s {result.rss_mb:+7.0f} MiB"
+        f"  {status}"
+    )
+
+
+def main(args: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="bd_gridfinity",
+        description="Build and export a catalog of gridfinity parts.",
+    )
+    parser.add_argument(
+        "--bins",
+        action="append",
+        default=[],
+        type=lambda value: parse_matrix(value, 3),
+        metavar="XxYxH",
+        help="bin sizes, e.g. 1-4x1-4x2-6",
+    )
+    parser.add_argument(
+        "--baseplates",
+        action="append",
+        default=[],
+        type=lambda value: parse_matrix(value, 2),
+        metavar="XxY",
+        help="baseplate sizes, e.g. 1-5x1-5",
+    )
+    parser.add_argument(
+        "--format",
+        dest="formats",
+        action="append",
+        choices=["step", "stl"],
+        help="export formats (default: step)",
+    )
+    parser.add_argument("--out", type=Path, default=Path("export/catalog"))
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parsed = parser.parse_args(args)
+
+    items = [
+        *[CatalogItem("bin", units) for sizes in parsed.bins for units in sizes],
+        *[
+            CatalogItem("baseplate", units)
+            for sizes in parsed.baseplates
+            for units in sizes
+        ],
+    ]
+    if not items:
+        parser.error("nothing to build, pass --bins and/or --baseplates")
+
+    start = perf_counter()
+    results = build_catalog(
+        items,
+        parsed.out,
+        parsed.formats or ["step"],
+        workers=parsed.workers,
+    )
+    failed = [result for result in results if result.error]
+    print(
+        f"Built {len(results) - len(failed)}/{len(results)} parts"
+        f" in {perf_counter() - start:.1f}s -> {parsed.out / 'manifest.json'}"
+    )
+    if failed:
+        raise SystemExit(1)
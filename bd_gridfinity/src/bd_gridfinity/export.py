@@ -0,0 +1,61 @@
+from pathlib import Path
+from typing import Hashable, Iterable
+
+import bd_utils as bdu
+from build123d import *
+
+from .lazy import PartSpec
+
+
+def export_3mf(
+    path: Path | str,
+    parts: Iterable[PartSpec | Part | tuple[PartSpec | Part, Location]],
+    tolerance: float = 0.01,
+    angular_tolerance: float = 0.1,
+) -> Path:
+    """Write parts to a 3MF with one mesh per unique component.
+
+    Bins share their `BinBase` feet, baseplates share their cells, and equal
+    specs share one object, so every copy is written as a transform. Meshes are
+    streamed to the file as they are tessellated. Components of a part touch
+    but aren't fused; slicers merge the volumes within an object. Built parts,
+    such as those on a `Bed`, are written as one mesh each, shared by their
+    copies.
+    """
+    path = Path(path)
+    meshes: dict[Hashable, int] = {}
+    objects: dict[PartSpec, int] = {}
+    part_objects: dict[int, tuple[Part, int]] = {}
+
+    with bdu.ThreeMFWriter(path) as writer:
+        for item in parts:
+            spec, location = item if isinstance(item, tuple) else (item, Location())
+            if isinstance(spec, Part):
+                # Keyed by identity, holding the part so its id isn't reused
+                if id(spec) not in part_objects:
+                    mesh = bdu.tessellate(spec, tolerance, angular_tolerance)
+                    part_objects[id(spec)] = (
+                        spec,
+                        writer.add_mesh(mesh, name=spec.label or None),
+                    )
+                writer.add_item(part_objects[id(spec)][1], location)
+                continue
+
+            if spec not in objects:
+                components = []
+                for component in spec.components():
+                    if component.key not in meshes:
+                        meshes[component.key] = writer.add_mesh(
+                            bdu.tessellate(
+                                component.build(), tolerance, angular_tolerance
+                            )
+                        )
+                    components += [
+                        (meshes[component.key], component_location)
+                        for component_location in component.locations
+                    ]
+                objects[spec] = writer.add_components(components, name=spec.name)
+
+            writer.add_item(objects[spec], location)
+
+    return path
@@ -0,0 +1,383 @@
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import cache, cached_property, partial
+from typing import Callable, Hashable, Iterable
+
+import bd_utils as bdu
+from build123d import *
+
+from . import baseplate, bin
+from .baseplate import Baseplate, DovetailSide, all_dovetail_sides
+from .bin import Bin, BinBase, BinShell, LipMode
+from .spec import *
+
+
+@dataclass
+class Component:
+    """Geometry repeated within a part. Components with equal keys are identical."""
+
+    key: Hashable
+    build: Callable[[], Part]
+    locations: list[Location]
+
+
+class PartSpec(ABC):
+    """Dimensions of a part, computed from the spec without building it.
+
+    The solid is only built when `part` is first accessed, then kept.
+    """
+
+    @property
+    @abstractmethod
+    def name(self) -> str: ...
+
+    @property
+    @abstractmethod
+    def size(self) -> tuple[float, float, float]:
+        """Outer bounding box size."""
+
+    @property
+    @abstractmethod
+    def volume(self) -> float:
+        """Estimated volume. Ignores the small fillets on magnet holes."""
+
+    @property
+    def footprint_area(self) -> float:
+        """Area the part covers on the print bed."""
+        x, y, _ = self.size
+        return x * y
+
+    @cached_property
+    def part(self) -> Part:
+        return self._build()
+
+    def components(self) -> list[Component]:
+        """The part split into repeated pieces that together make up its volume."""
+        return [Component(self, lambda: self.part, [Location()])]
+
+    def fits(self, bed_size: tuple[float, ...]) -> bool:
+        """Whether the part fits a bed of (x, y) or (x, y, z), turned if needed."""
+        x, y, z = self.size
+        bed_x, bed_y = bed_size[:2]
+        if len(bed_size) > 2 and z > bed_size[2]:
+            return False
+
+        return (x <= bed_x and y <= bed_y) or (y <= bed_x and x <= bed_y)
+
+    @abstractmethod
+    def _build(self) -> Part: ...
+
+
+@dataclass(frozen=True)
+class BinSpec(PartSpec):
+    x_units: int = 1
+    y_units: int = 1
+    height_units: int = 3
+    lip: LipMode = "sweep"
+
+    @property
+    def name(self) -> str:
+        name = f"bin_{self.x_units}x{self.y_units}x{self.height_units}"
+        return name if self.lip == "sweep" else f"{name}_{self.lip}"
+
+    @property
+    def size(self) -> tuple[float, float, float]:
+        return (
+            _bin_body_size(self.x_units),
+            _bin_body_size(self.y_units),
+            self.height_units * height_unit + _lip_peak(),
+        )
+
+    @property
+    def volume(self) -> float:
+        width = _bin_body_size(self.x_units)
+        length = _bin_body_size(self.y_units)
+        body_height = self.height_units * height_unit - bin.base_height
+
+        inset = bin.wall_width
+        body = _rounded_rect_area(
+            width, length, bin.corner_radius
+        ) * body_height - _rounded_rect_area(
+            width - 2 * inset,
+            length - 2 * inset,
+            max(bin.corner_radius - inset, 0),
+        ) * (body_height - inset)
+
+        area, centroid = _lip_profile()
+        # Pappus: sweeping around the corners shortens the path at the centroid
+        path = _rounded_rect_perimeter(width, length, bin.corner_radius)
+        lip = area * (path - 2 * math.pi * centroid)
+
+        return self.x_units * self.y_units * _bin_base_volume() + body + lip
+
+    @property
+    def footprint_area(self) -> float:
+        return _rounded_rect_area(
+            _bin_body_size(self.x_units),
+            _bin_body_size(self.y_units),
+            bin.corner_radius,
+        )
+
+    def components(self) -> list[Component]:
+        feet = bdu.grid_locations(grid_unit, grid_unit, self.x_units, self.y_units)
+        shell = (self.x_units, self.y_units, self.height_units)
+
+        return [
+            Component(BinBase, partial(BinBase, align="**+"), feet),
+            Component(
+                (BinShell, *shell, self.lip),
+                partial(BinShell, *shell, lip=self.lip),
+                [Location()],
+            ),
+        ]
+
+    def _build(self) -> Part:
+        return Bin(self.x_units, self.y_units, self.height_units, lip=self.lip)
+
+
+@dataclass(frozen=True)
+class BaseplateSpec(PartSpec):
+    x_units: int
+    y_units: int
+    dovetail_sides: tuple[DovetailSide, ...] = all_dovetail_sides
+
+    def __init__(
+        self,
+        x_units: int,
+        y_units: int,
+        dovetail_sides: Iterable[DovetailSide] = all_dovetail_sides,
+    ):
+        object.__setattr__(self, "x_units", x_units)
+        object.__setattr__(self, "y_units", y_units)
+        object.__setattr__(
+            self,
+            "dovetail_sides",
+            tuple(side for side in all_dovetail_sides if side in set(dovetail_sides)),
+        )
+
+    @property
+    def name(self) -> str:
+        name = f"baseplate_{self.x_units}x{self.y_units}"
+        if self.dovetail_sides == all_dovetail_sides:
+            return name
+
+        return f"{name}_{'_'.join(self.dovetail_sides) or 'none'}"
+
+    @property
+    def size(self) -> tuple[float, float, float]:
+        return (
+            self.x_units * grid_unit,
+            self.y_units * grid_unit,
+            baseplate.height,
+        )
+
+    @property
+    def volume(self) -> float:
+        units_per_side = {"x": self.y_units, "y": self.x_units}
+        dovetails = sum(units_per_side[side[1]] for side in self.dovetail_sides)
+
+        # Dovetails are centered on the edge, so half of each is inside the plate
+        return (
+            self.x_units * self.y_units * _baseplate_unit_volume()
+            - dovetails * _dovetail_volume() / 2
+        )
+
+    def components(self) -> list[Component]:
+        """One component per combination of dovetailed edges among the cells."""
+        cells: dict[tuple[DovetailSide, ...], list[Location]] = {}
+        for cell in self._cells():
+            cells.setdefault(cell.dovetail_sides, []).append(Pos(*cell.center))
+
+        cache_inputs = bdu.current_options().cache_inputs
+        return [
+            Component(
+                (baseplate.BaseplateUnit, sides),
+                partial(baseplate._cell_template, sides, cache_inputs),
+                locations,
+            )
+            for sides, locations in cells.items()
+        ]
+
+    def mesh(self, tolerance: float = 0.01, angular_tolerance: float = 0.1) -> bdu.Mesh:
+        """The plate's mesh, assembled without building or meshing the fused plate.
+
+        Each kind of cell is tessellated once with the faces on its seams
+        removed, then translated into place and welded to its neighbors.
+        """
+        cells: dict[tuple, list[tuple[float, float, float]]] = {}
+        for cell in self._cells():
+            cells.setdefault((cell.dovetail_sides, cell.seam_sides), []).append(
+                (*cell.center, 0)
+            )
+
+        return bdu.merge(
+            _cell_mesh(
+                *sides,
+                tolerance,
+                angular_tolerance,
+                bdu.current_options().cache_inputs,
+            ).instanced(centers)
+            for sides, centers in cells.items()
+        )
+
+    def _cells(self) -> list["_Cell"]:
+        cells = []
+        for column in range(self.x_units):
+            for row in range(self.y_units):
+                is_edge = {
+                    "-x": column == 0,
+                    "+x": column == self.x_units - 1,
+                    "-y": row == 0,
+                    "+y": row == self.y_units - 1,
+                }
+                center = (
+                    (column - (self.x_units - 1) / 2) * grid_unit,
+                    (row - (self.y_units - 1) / 2) * grid_unit,
+                )
+                cells.append(
+                    _Cell(
+                        center,
+                        tuple(side for side in self.dovetail_sides if is_edge[side]),
+                        tuple(side for side in all_dovetail_sides if not is_edge[side]),
+                    )
+                )
+
+        return cells
+
+    def _build(self) -> Part:
+        return Baseplate(
+            self.x_units,
+            self.y_units,
+            dovetail_sides=self.dovetail_sides,
+        )
+
+
+@dataclass(frozen=True)
+class _Cell:
+    center: tuple[float, float]
+    dovetail_sides: tuple[DovetailSide, ...]
+    seam_sides: tuple[DovetailSide, ...]
+    """Edges shared with a neighboring cell."""
+
+
+@cache
+def _cell_mesh(
+    dovetail_sides: tuple[DovetailSide, ...],
+    seam_sides: tuple[DovetailSide, ...],
+    tolerance: float,
+    angular_tolerance: float,
+    cache_inputs: tuple,
+) -> bdu.Mesh:
+    mesh = bdu.tessellate(
+        baseplate._cell_template(dovetail_sides, cache_inputs),
+        tolerance,
+        angular_tolerance,
+    )
+    for side in seam_sides:
+        sign = -1 if side[0] == "-" else 1
+        mesh = mesh.without_plane("xy".index(side[1]), sign * grid_unit / 2)
+
+    return mesh
+
+
+def _bin_body_size(units: int) -> float:
+    return units * bin.size + (units - 1) * bin.tolerance_gap * 2
+
+
+def _lip_peak() -> float:
+    """Height of the lip above the body, lowered by the fillet on its tip."""
+    tip_angle = math.radians(bin.lip_steps[-1][1])
+    return bin.lip_height - bin.lip_radius / math.tan(tip_angle / 2) + bin.lip_radius
+
+
+def _lip_profile() -> tuple[float, float]:
+    """Area of the filleted lip profile and its centroid's inset from the outer wall."""
+    points = [(0.0, 0.0), (0.0, bin.lip_height)]
+    for amount, taper in reversed(bin.lip_steps):
+        x, y = points[-1]
+        points.append((x + amount * math.tan(math.radians(taper)), y - amount))
+
+    area = 0.0
+    moment = 0.0
+    for (x0, y0), (x1, y1) in zip(points, points[1:] + points[:1]):
+        cross = x0 * y1 - x1 * y0
+        area += cross / 2
+        moment += (x0 + x1) * cross / 6
+    area, moment = abs(area), abs(moment)
+
+    tip_angle = math.radians(bin.lip_steps[-1][1])
+    fillet = bin.lip_radius**2 * (
+        1 / math.tan(tip_angle / 2) - (math.pi - tip_angle) / 2
+    )
+
+    return area - fillet, moment / area
+
+
+def _bin_base_volume() -> float:
+    return _stepped_volume(
+        bin.size, bin.size, bin.corner_radius, bin.base_height_steps
+    ) - 4 * _magnet_hole_volume()
+
+
+def _baseplate_unit_volume() -> float:
+    walls = _stepped_volume(
+        grid_unit, grid_unit, baseplate.corner_radius, baseplate.wall_height_steps
+    )
+
+    opening = grid_unit - 2 * baseplate.total_side_width
+    pad = opening / 2 - (baseplate.inner_wall_corner.X - baseplate.magnet_pad_size)
+    pad_area = pad**2 - (1 - math.pi / 4) * baseplate.corner_radius**2
+    plate = (opening**2 - 4 * pad_area) * (baseplate.height - baseplate.wall_height)
+
+    return (
+        grid_unit * grid_unit * baseplate.height
+        - walls
+        - plate
+        - 4 * _magnet_hole_volume()
+    )
+
+
+def _dovetail_volume() -> float:
+    width = 10 * MM
+    height = baseplate.total_side_width - 1
+    top_width = width - 2 * height / math.tan(math.radians(60))
+
+    return 2 * (width + top_width) / 2 * height * 2 * MM
+
+
+def _magnet_hole_volume() -> float:
+    radius = (magnet_diameter + magnet_tolerance) / 2
+    return math.pi * radius**2 * magnet_thickness
+
+
+def _stepped_volume(
+    width: float,
+    length: float,
+    radius: float,
+    steps: list[tuple[float, float]],
+) -> float:
+    """Volume of a rounded rectangle extruded through `(amount, taper)` steps."""
+    volume = 0.0
+    inset = 0.0
+    for amount, taper in steps:
+        end = inset + amount * math.tan(math.radians(taper))
+
+        def area(inset: float) -> float:
+            return _rounded_rect_area(
+                width - 2 * inset, length - 2 * inset, max(radius - inset, 0)
+            )
+
+        # Simpson's rule is exact for the quadratic area of a tapered step
+        volume += amount * (area(inset) + 4 * area((inset + end) / 2) + area(end)) / 6
+        inset = end
+
+    return volume
+
+
+def _rounded_rect_area(width: float, length: float, radius: float) -> float:
+    return width * length - (4 - math.pi) * radius**2
+
+
+def _rounded_rect_perimeter(width: float, length: float, radius: float) -> float:
+    return 2 * (width + length) - (8 - 2 * math.pi) * radius
@@ -0,0 +1,196 @@
+from dataclasses import dataclass, field
+from typing import Iterable, TypeAlias
+
+import bd_utils as bdu
+from build123d import *
+
+from .lazy import PartSpec
+
+Packable: TypeAlias = PartSpec | Part
+
+
+@dataclass(frozen=True)
+class BedPlacement:
+    item: Packable
+    center: tuple[float, float]
+    """Center of the item's footprint, relative to the center of the bed."""
+    rotated: bool
+    """Whether the item is turned 90 degrees to fit."""
+    offset: tuple[float, float] = (0, 0)
+    """Center of the item's footprint in its own coordinates."""
+
+    @property
+    def location(self) -> Location:
+        turn = Rot(0, 0, 90) if self.rotated else Location()
+        return Pos(*self.center) * turn * Pos(-self.offset[0], -self.offset[1])
+
+
+@dataclass
+class Bed:
+    """One print plate's worth of parts."""
+
+    size: tuple[float, float]
+    placements: list[BedPlacement] = field(default_factory=list)
+    used_area: float = 0
+    """Footprint area of the placed parts, with bins' corners rounded."""
+
+    @property
+    def utilization(self) -> float:
+        return self.used_area / (self.size[0] * self.size[1])
+
+    @property
+    def items(self) -> list[tuple[Packable, Location]]:
+        """Items with their locations, as `export_3mf` takes them."""
+        return [(placement.item, placement.location) for placement in self.placements]
+
+    def part(self) -> Part:
+        """Every part on the bed in place, sharing the geometry of equal specs."""
+        specs: dict[PartSpec, Part] = {}
+        solids = []
+        for placement in self.placements:
+            part = placement.item
+            if isinstance(part, PartSpec):
+                part = specs.setdefault(part, part.part)
+            solids += bdu.place_copies(part, [placement.location])
+
+        return bdu.as_part(Compound.make_compound(solids))
+
+
+def pack_beds(
+    items: Iterable[Packable],
+    bed_size: tuple[float, ...] = (220 * MM, 220 * MM),
+    spacing: float = 2 * MM,
+) -> list[Bed]:
+    """Arrange parts on as few beds of `bed_size` as the packer manages.
+
+    Footprints are packed as rectangles `spacing` apart, turned when that fits
+    better, with the maximal rectangles algorithm: each bed keeps every largest
+    free rectangle, and a part goes where it leaves the shortest leftover side.
+    Larger parts are placed first, each on the first bed it fits. Specs are
+    packed from their dimensions without being built.
+    """
+    bed_x, bed_y = bed_size[:2]
+    footprints = []
+    for item in items:
+        width, length, height, offset = _footprint(item)
+        if len(bed_size) > 2 and height > bed_size[2]:
+            raise ValueError(f"{_name(item)} is taller than the bed")
+        if not (
+            (width <= bed_x and length <= bed_y) or (length <= bed_x and width <= bed_y)
+        ):
+            raise ValueError(f"{_name(item)} doesn't fit a {bed_x}x{bed_y} bed")
+        footprints.append((item, width, length, offset))
+
+    footprints.sort(key=lambda footprint: -footprint[1] * footprint[2])
+
+    beds: list[Bed] = []
+    packers: list[_BedPacker] = []
+    for item, width, length, offset in footprints:
+        for bed, packer in zip(beds, packers):
+            spot = packer.insert(width + spacing, length + spacing)
+            if spot is not None:
+                break
+        else:
+            bed = Bed((bed_x, bed_y))
+            packer = _BedPacker(bed_x + spacing, bed_y + spacing)
+            beds.append(bed)
+            packers.append(packer)
+            spot = packer.insert(width + spacing, length + spacing)
+            assert spot is not None
+
+        x, y, rotated = spot
+        if rotated:
+            width, length = length, width
+        bed.placements.append(
+            BedPlacement(
+                item,
+                (x + (width - bed_x) / 2, y + (length - bed_y) / 2),
+                rotated,
+                offset,
+            )
+        )
+        bed.used_area += _footprint_area(item, width, length)
+
+    return beds
+
+
+class _BedPacker:
+    """Free space of one bed, as the maximal rectangles not covered by parts."""
+
+    def __init__(self, width: float, length: float):
+        self.free = [(0.0, 0.0, width, length)]
+
+    def insert(self, width: float, length: float) -> tuple[float, float, bool] | None:
+        """Place a rectangle, returning its corner and whether it was turned."""
+        best = None
+        best_score = (float("inf"), float("inf"))
+        for x, y, free_width, free_length in self.free:
+            for w, l, rotated in ((width, length, False), (length, width, True)):
+                if w > free_width + 1e-9 or l > free_length + 1e-9:
+                    continue
+                left_x, left_y = free_width - w, free_length - l
+                score = (min(left_x, left_y), max(left_x, left_y))
+                if score < best_score:
+                    best, best_score = (x, y, w, l, rotated), score
+
+        if best is None:
+            return None
+
+        x, y, w, l, rotated = best
+        self._split(x, y, w, l)
+        return x, y, rotated
+
+    def _split(self, x: float, y: float, width: float, length: float):
+        right, top = x + width, y + length
+        free = []
+        for rect in self.free:
+            fx, fy, fw, fl = rect
+            if fx >= right or fx + fw <= x or fy >= top or fy + fl <= y:
+                free.append(rect)
+                continue
+
+            # the parts of the free rectangle left, right, below and above it
+            if fx < x:
+                free.append((fx, fy, x - fx, fl))
+            if fx + fw > right:
+                free.append((right, fy, fx + fw - right, fl))
+            if fy < y:
+                free.append((fx, fy, fw, y - fy))
+            if fy + fl > top:
+                free.append((fx, top, fw, fy + fl - top))
+
+        self.free = [
+            rect
+            for index, rect in enumerate(free)
+            if not any(
+                _contains(other, rect) and (other != rect or other_index < index)
+                for other_index, other in enumerate(free)
+                if other_index != index
+            )
+        ]
+
+
+def _contains(outer: tuple, inner: tuple) -> bool:
+    ox, oy, ow, ol = outer
+    ix, iy, iw, il = inner
+    return ox <= ix and oy <= iy and ix + iw <= ox + ow and iy + il <= oy + ol
+
+
+def _footprint(item: Packable) -> tuple[float, float, float, tuple[float, float]]:
+    """(width, length, height, center) of an item's bounding box."""
+    if isinstance(item, PartSpec):
+        width, length, height = item.size
+        return width, length, height, (0, 0)
+
+    box = item.bounding_box()
+    return box.size.X, box.size.Y, box.size.Z, (box.center().X, box.center().Y)
+
+
+def _footprint_area(item: Packable, width: float, length: float) -> float:
+    if isinstance(item, PartSpec):
+        return item.footprint_area
+    return width * length
+
+
+def _name(item: Packable) -> str:
+    return item.name if isinstance(item, PartSpec) else item.label or "part"
@@ -0,0 +1,409 @@
+import math
+from typing import TypeAlias
+
+import bd_utils as bdu
+import numpy as np
+
+from . import baseplate, bin
+from .spec import *
+
+Steps: TypeAlias = list[tuple[float, float]]
+
+
+def baseplate_unit_mesh(
+    wall_height_steps: Steps | None = None,
+    segments: int = 8,
+) -> bdu.Mesh:
+    """A `BaseplateUnit` meshed straight from the spec, without OCC.
+
+    Aligned like the built unit, centered on XY with its bottom at Z=0. Magnet
+    hole fillets are left out.
+    """
+    steps = wall_height_steps or baseplate.wall_height_steps
+    height = baseplate.height
+    half = grid_unit / 2
+    radius = baseplate.corner_radius
+    floor = height - sum(amount for amount, _ in steps)
+    wall_width = sum(_inset(amount, taper) for amount, taper in steps)
+    opening = half - wall_width - baseplate.lip_width
+    pad = half - wall_width - baseplate.magnet_pad_size
+    hole_radius = (magnet_diameter + magnet_tolerance) / 2
+    magnet = (magnet_center.X, magnet_center.Y)
+    hole_floor = floor - magnet_thickness
+
+    triangles = [
+        _wall(_square(half, 0), _square(half, height)),
+        *_mirrored(
+            _cap(
+                _fan(
+                    (half, half),
+                    [
+                        (half, half),
+                        *_arc((half - radius,) * 2, radius, 0, 90, segments),
+                    ],
+                ),
+                height,
+                up=True,
+            )
+        ),
+    ]
+
+    rings = [
+        _rounded_rect(half - inset, radius - inset, z, segments)
+        for z, inset in _stepped_levels(height, steps)
+    ]
+    triangles += [
+        _wall(lower, upper, hole=True) for upper, lower in zip(rings, rings[1:])
+    ]
+
+    opening_ring = _mirror_loop(
+        [
+            (opening, 0),
+            (opening, pad),
+            *_arc((pad + radius,) * 2, radius, 270, 180, segments),
+            (pad, opening),
+            (0, opening),
+        ]
+    )
+    triangles.append(
+        _wall(_at(opening_ring, 0), _at(opening_ring, floor), hole=True)
+    )
+
+    inner_half = half - wall_width
+    inner_radius = max(radius - wall_width, 0)
+    floor_pad = [
+        (pad + radius, pad),
+        (inner_half, pad),
+        *_arc((inner_half - inner_radius,) * 2, inner_radius, 0, 90, segments),
+        (pad, inner_half),
+        *_arc((pad + radius,) * 2, radius, 180, 270, segments),
+    ]
+    bottom_pad = [
+        (pad + radius, pad),
+        (half, pad),
+        (half, half),
+        (pad, half),
+        *_arc((pad + radius,) * 2, radius, 180, 270, segments),
+    ]
+    magnet_hole = _circle(magnet, hole_radius, 4 * segments)
+    for quadrant in [
+        _cap(_star_fill(magnet, floor_pad, magnet_hole), floor, up=True),
+        _cap(_rectangle((0, opening), (pad, inner_half)), floor, up=True),
+        _cap(_rectangle((opening, 0), (inner_half, pad)), floor, up=True),
+        _cap(_star_fill(magnet, bottom_pad), 0, up=False),
+        _cap(_rectangle((0, opening), (pad, half)), 0, up=False),
+        _cap(_rectangle((opening, 0), (half, pad)), 0, up=False),
+        _wall(_at(magnet_hole, hole_floor), _at(magnet_hole, floor), hole=True),
+        _cap(_fan(magnet, magnet_hole), hole_floor, up=True),
+    ]:
+        triangles += _mirrored(quadrant)
+
+    return _to_mesh(triangles)
+
+
+def bin_base_mesh(
+    base_height_steps: Steps | None = None,
+    segments: int = 8,
+) -> bdu.Mesh:
+    """A `BinBase` meshed straight from the spec, without OCC.
+
+    Aligned like the built base, centered on XY with its bottom at Z=0. Magnet
+    hole fillets are left out.
+    """
+    steps = base_height_steps or bin.base_height_steps
+    height = sum(amount for amount, _ in steps)
+    half = bin.size / 2
+    radius = bin.corner_radius
+    hole_radius = (magnet_diameter + magnet_tolerance) / 2
+    magnet = (magnet_center.X, magnet_center.Y)
+
+    levels = _stepped_levels(height, steps)
+    rings = [
+        _rounded_rect(half - inset, radius - inset, z, segments) for z, inset in levels
+    ]
+    triangles = [_wall(lower, upper) for upper, lower in zip(rings, rings[1:])]
+    triangles.append(_cap(_fan((0, 0), rings[0][:, :2]), height, up=True))
+
+    bottom_half = half - levels[-1][1]
+    bottom_radius = max(radius - levels[-1][1], 0)
+    bottom = [
+        (0, 0),
+        (bottom_half, 0),
+        *_arc((bottom_half - bottom_radius,) * 2, bottom_radius, 0, 90, segments),
+        (0, bottom_half),
+    ]
+    magnet_hole = _circle(magnet, hole_radius, 4 * segments)
+    for quadrant in [
+        _cap(_star_fill(magnet, bottom, magnet_hole), 0, up=False),
+        _wall(_at(magnet_hole, 0), _at(magnet_hole, magnet_thickness), hole=True),
+        _cap(_fan(magnet, magnet_hole), magnet_thickness, up=False),
+    ]:
+        triangles += _mirrored(quadrant)
+
+    return _to_mesh(triangles)
+
+
+def lip_mesh(
+    x_units: int = 1,
+    y_units: int = 1,
+    lip_steps: Steps | None = None,
+    segments: int = 8,
+) -> bdu.Mesh:
+    """The lip swept around the top of a bin, without OCC.
+
+    Centered on XY with its bottom at Z=0, where it sits on the bin walls.
+    """
+    steps = lip_steps or bin.lip_steps
+    height = sum(amount for amount, _ in steps)
+    half_x = (x_units * bin.size + (x_units - 1) * bin.tolerance_gap * 2) / 2
+    half_y = (y_units * bin.size + (y_units - 1) * bin.tolerance_gap * 2) / 2
+
+    profile = [(0.0, 0.0), (0.0, height)]
+    for amount, taper in reversed(steps):
+        inset, z = profile[-1]
+        profile.append((inset + _inset(amount, taper), z - amount))
+    tip = _fillet(profile[1], profile[0], profile[2], bin.lip_radius, segments)
+    profile[1:2] = tip
+
+    rings = [
+        _rounded_rect(
+            (half_x - inset, half_y - inset), bin.corner_radius - inset, z, segments
+        )
+        for inset, z in profile
+    ]
+    triangles = [
+        _wall(ring, next_ring) for ring, next_ring in zip(rings, rings[1:] + rings[:1])
+    ]
+
+    mesh = _to_mesh(triangles)
+    if mesh.volume < 0:
+        mesh.triangles = mesh.triangles[:, ::-1]
+
+    return mesh
+
+
+def _inset(amount: float, taper: float) -> float:
+    return amount * math.tan(math.radians(taper))
+
+
+def _stepped_levels(height: float, steps: Steps) -> list[tuple[float, float]]:
+    """(z, inset) of every ring of a stepped extrusion down from `height`."""
+    levels = [(height, 0.0)]
+    for amount, taper in steps:
+        z, inset = levels[-1]
+        levels.append((z - amount, inset + _inset(amount, taper)))
+
+    return levels
+
+
+def _arc(
+    center: tuple[float, float],
+    radius: float,
+    start: float,
+    end: float,
+    segments: int,
+) -> list[tuple[float, float]]:
+    angles = np.radians(np.linspace(start, end, segments + 1))
+    return list(
+        zip(center[0] + radius * np.cos(angles), center[1] + radius * np.sin(angles))
+    )
+
+
+def _circle(
+    center: tuple[float, float], radius: float, segments: int
+) -> np.ndarray:
+    angles = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    return np.column_stack(
+        [center[0] + radius * np.cos(angles), center[1] + radius * np.sin(angles)]
+    )
+
+
+def _fillet(
+    corner: tuple[float, float],
+    before: tuple[float, float],
+    after: tuple[float, float],
+    radius: float,
+    segments: int,
+) -> list[tuple[float, float]]:
+    """Points rounding `corner`, from the side of `before` to the side of `after`."""
+    point = np.array(corner, dtype=float)
+    to_before = np.subtract(before, point) / np.linalg.norm(np.subtract(before, point))
+    to_after = np.subtract(after, point) / np.linalg.norm(np.subtract(after, point))
+    angle = math.acos(np.clip(to_before @ to_after, -1, 1))
+    bisector = (to_before + to_after) / np.linalg.norm(to_before + to_after)
+    center = point + bisector * radius / math.sin(angle / 2)
+
+    start, end = (
+        point + direction * radius / math.tan(angle / 2)
+        for direction in (to_before, to_after)
+    )
+    start_angle, end_angle = (
+        math.atan2(tangent[1] - center[1], tangent[0] - center[0])
+        for tangent in (start, end)
+    )
+    sweep = (end_angle - start_angle + math.pi) % (2 * math.pi) - math.pi
+
+    return _arc(
+        tuple(center),
+        radius,
+        math.degrees(start_angle),
+        math.degrees(start_angle + sweep),
+        segments,
+    )
+
+
+def _mirror_loop(quadrant: list[tuple[float, float]]) -> np.ndarray:
+    """Close a path from the +X axis to the +Y axis into a loop around the origin."""
+    path = np.array(quadrant, dtype=float)
+    loop = np.concatenate(
+        [
+            path,
+            (path * (-1, 1))[::-1][1:],
+            (path * (-1, -1))[1:],
+            (path * (1, -1))[::-1][1:-1],
+        ]
+    )
+    is_repeat = np.all(np.isclose(loop, np.roll(loop, 1, axis=0)), axis=1)
+
+    return loop[~is_repeat]
+
+
+def _rounded_rect(
+    half: float | tuple[float, float], radius: float, z: float, segments: int
+) -> np.ndarray:
+    """A rounded rectangle at height `z`, with the same vertex count for any radius."""
+    half_x, half_y = half if isinstance(half, tuple) else (half, half)
+    radius = max(radius, 0)
+    corner = (half_x - radius, half_y - radius)
+    quadrant = _arc(corner, radius, 0, 90, segments)
+    loop = np.concatenate(
+        [
+            np.array(quadrant),
+            np.array([(-x, y) for x, y in quadrant[::-1]]),
+            np.array([(-x, -y) for x, y in quadrant]),
+            np.array([(x, -y) for x, y in quadrant[::-1]]),
+        ]
+    )
+
+    return _at(loop, z)
+
+
+def _square(half: float, z: float) -> np.ndarray:
+    corners = [(half, -half), (half, half), (-half, half), (-half, -half)]
+    return _at(np.array(corners), z)
+
+
+def _rectangle(start: tuple[float, float], end: tuple[float, float]) -> np.ndarray:
+    (x0, y0), (x1, y1) = start, end
+    return np.array([[(x0, y0), (x1, y0), (x1, y1)], [(x0, y0), (x1, y1), (x0, y1)]])
+
+
+def _at(loop: np.ndarray, z: float) -> np.ndarray:
+    loop = np.asarray(loop, dtype=float)
+    return np.column_stack([loop[:, :2], np.full(len(loop), z)])
+
+
+def _wall(lower: np.ndarray, upper: np.ndarray, hole: bool = False) -> np.ndarray:
+    """Triangles joining two counter-clockwise rings, facing away from their axis.
+
+    Holes face inward, toward the empty space inside the ring.
+    """
+    next_lower = np.roll(lower, -1, axis=0)
+    next_upper = np.roll(upper, -1, axis=0)
+    triangles = np.concatenate(
+        [
+            np.stack([lower, next_lower, next_upper], axis=1),
+            np.stack([lower, next_upper, upper], axis=1),
+        ]
+    )
+
+    return triangles[:, ::-1] if hole else triangles
+
+
+def _fan(apex: tuple[float, float], loop) -> np.ndarray:
+    loop = np.asarray(loop, dtype=float)[:, :2]
+    apexes = np.broadcast_to(np.asarray(apex, dtype=float), loop.shape)
+    return np.stack([apexes, loop, np.roll(loop, -1, axis=0)], axis=1)
+
+
+def _star_fill(center, outer, hole=None) -> np.ndarray:
+    """Triangulate a region that every ray from `center` crosses once.
+
+    Rays are cast through every vertex of the outer boundary and the hole,
+    so both boundaries are followed exactly.
+    """
+    center = np.array(center, dtype=float)
+    outer = np.asarray(outer, dtype=float)[:, :2]
+    loops = [outer] if hole is None else [outer, np.asarray(hole, dtype=float)[:, :2]]
+    offsets = np.concatenate(loops) - center
+    angles = np.unique(np.round(np.arctan2(offsets[:, 1], offsets[:, 0]), 12))
+    directions = np.column_stack([np.cos(angles), np.sin(angles)])
+
+    outer_hits = _ray_hits(center, directions, outer)
+    inner_hits = (
+        np.broadcast_to(center, outer_hits.shape)
+        if hole is None
+        else _ray_hits(center, directions, loops[1])
+    )
+    next_outer = np.roll(outer_hits, -1, axis=0)
+    next_inner = np.roll(inner_hits, -1, axis=0)
+
+    return np.concatenate(
+        [
+            np.stack([inner_hits, outer_hits, next_outer], axis=1),
+            np.stack([inner_hits, next_outer, next_inner], axis=1),
+        ]
+    )
+
+
+def _ray_hits(
+    center: np.ndarray, directions: np.ndarray, loop: np.ndarray
+) -> np.ndarray:
+    """Nearest point where each ray from `center` crosses the closed `loop`."""
+    starts = loop - center
+    edges = np.roll(loop, -1, axis=0) - loop
+
+    def cross(a, b):
+        return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+    denominators = cross(directions[:, np.newaxis], edges[np.newaxis])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        distances = cross(starts[np.newaxis], edges[np.newaxis]) / denominators
+        positions = cross(starts[np.newaxis], directions[:, np.newaxis]) / denominators
+    is_hit = (
+        (np.abs(denominators) > 1e-12)
+        & (distances > 1e-9)
+        & (positions >= -1e-9)
+        & (positions <= 1 + 1e-9)
+    )
+    distances = np.where(is_hit, distances, np.inf).min(axis=1)
+
+    return center + directions * distances[:, np.newaxis]
+
+
+def _cap(triangles: np.ndarray, z: float, up: bool) -> np.ndarray:
+    """Flat triangles at height `z`, wound to face up or down."""
+    triangles = np.asarray(triangles, dtype=float)[..., :2]
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    facing_up = (b - a)[:, 0] * (c - a)[:, 1] - (b - a)[:, 1] * (c - a)[:, 0] > 0
+    is_flipped = (facing_up != up)[:, np.newaxis, np.newaxis]
+    triangles = np.where(is_flipped, triangles[:, ::-1], triangles)
+
+    return np.concatenate([triangles, np.full((*triangles.shape[:2], 1), z)], axis=2)
+
+
+def _mirrored(triangles: np.ndarray) -> list[np.ndarray]:
+    """A first-quadrant piece copied into all four quadrants, keeping its facing."""
+    return [
+        triangles,
+        (triangles * (-1, 1, 1))[:, ::-1],
+        triangles * (-1, -1, 1),
+        (triangles * (1, -1, 1))[:, ::-1],
+    ]
+
+
+def _to_mesh(triangles: list[np.ndarray]) -> bdu.Mesh:
+    corners = np.concatenate(triangles).reshape(-1, 3)
+    return bdu.weld(
+        bdu.Mesh(corners, np.arange(len(corners)).reshape(-1, 3)), tolerance=1e-6
+    )
@@ -0,0 +1,180 @@
+import json
+import math
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from multiprocessing import get_context
+from pathlib import Path
+
+import bd_utils as bdu
+from build123d import *
+
+from .baseplate import Baseplate, DovetailSide, all_dovetail_sides
+from .spec import *
+
+
+@dataclass(frozen=True)
+class TileSpec:
+    """Everything that determines a tile's geometry. Equal specs build equal tiles."""
+
+    x_units: int
+    y_units: int
+    dovetail_sides: tuple[DovetailSide, ...]
+
+    @property
+    def name(self) -> str:
+        sides = "".join(self.dovetail_sides) or "none"
+        return f"baseplate_{self.x_units}x{self.y_units}_{sides}"
+
+    def build(self) -> Baseplate:
+        return Baseplate(
+            self.x_units,
+            self.y_units,
+            dovetail_sides=self.dovetail_sides,
+        )
+
+
+@dataclass(frozen=True)
+class TilePlacement:
+    spec: TileSpec
+    column: int
+    row: int
+    center: tuple[float, float]
+    """Tile center relative to the center of the full plate."""
+
+    @property
+    def location(self) -> Location:
+        return Pos(*self.center)
+
+
+class TiledBaseplate:
+    """A `Baseplate` grid split into tiles that each fit on the printer bed.
+
+    Tiles are sized as evenly as possible so most of them share a `TileSpec`,
+    and each unique spec is only built once. Dovetails are cut on every seam
+    between tiles, and on the outer edges only if `outer_dovetails` is set.
+    """
+
+    def __init__(
+        self,
+        x_units: int,
+        y_units: int,
+        bed_size: tuple[float, float] = (220 * MM, 220 * MM),
+        outer_dovetails: bool = False,
+    ):
+        self.x_units = x_units
+        self.y_units = y_units
+        self.bed_size = bed_size
+        self.outer_dovetails = outer_dovetails
+
+        self.columns = _split_units(x_units, bed_size[0])
+        self.rows = _split_units(y_units, bed_size[1])
+        self.placements = self._place_tiles()
+
+    @property
+    def unique_specs(self) -> list[TileSpec]:
+        return list(dict.fromkeys(placement.spec for placement in self.placements))
+
+    def build(self, workers: int | None = 1) -> dict[TileSpec, Part]:
+        """Build each unique tile once, in a process pool if `workers` != 1."""
+        specs = self.unique_specs
+        if workers == 1 or len(specs) == 1:
+            return {spec: spec.build() for spec in specs}
+
+        with tempfile.TemporaryDirectory() as tmp_dir, ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),
+        ) as pool:
+            paths = pool.map(
+                _build_tile_brep,
+                specs,
+                [Path(tmp_dir) / f"{spec.name}.brep" for spec in specs],
+            )
+            return {
+                spec: bdu.as_part(import_brep(str(path)))
+                for spec, path in zip(specs, paths)
+            }
+
+    def parts(self, workers: int | None = 1) -> list[Part]:
+        """Every tile moved to its place in the full plate, sharing geometry."""
+        tiles = self.build(workers)
+        return [
+            bdu.as_part(
+                Compound.make_compound(
+                    bdu.place_copies(tiles[placement.spec], [placement.location])
+                )
+            )
+            for placement in self.placements
+        ]
+
+    def export(
+        self,
+        out_dir: Path | str,
+        workers: int | None = 1,
+    ) -> Path:
+        """Write one STEP per unique tile plus `tiles.json` with every placement."""
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        for spec, part in self.build(workers).items():
+            part.export_step(str(out_dir / f"{spec.name}.step"))
+
+        manifest = {
+            "x_units": self.x_units,
+            "y_units": self.y_units,
+            "bed_size": self.bed_size,
+            "tiles": [
+                {**asdict(placement), "file": f"{placement.spec.name}.step"}
+                for placement in self.placements
+            ],
+        }
+        manifest_path = out_dir / "tiles.json"
+        manifest_path.write_text(json.dumps(manifest, indent=2))
+
+        return manifest_path
+
+    def _place_tiles(self) -> list[TilePlacement]:
+        placements = []
+        y = -self.y_units * grid_unit / 2
+        for row, y_units in enumerate(self.rows):
+            x = -self.x_units * grid_unit / 2
+            for column, x_units in enumerate(self.columns):
+                spec = TileSpec(x_units, y_units, self._dovetail_sides(column, row))
+                center = (
+                    x + x_units * grid_unit / 2,
+                    y + y_units * grid_unit / 2,
+                )
+                placements.append(TilePlacement(spec, column, row, center))
+                x += x_units * grid_unit
+            y += y_units * grid_unit
+
+        return placements
+
+    def _dovetail_sides(self, column: int, row: int) -> tuple[DovetailSide, ...]:
+        if self.outer_dovetails:
+            return all_dovetail_sides
+
+        is_inner = {
+            "-x": column > 0,
+            "+x": column < len(self.columns) - 1,
+            "-y": row > 0,
+            "+y": row < len(self.rows) - 1,
+        }
+        return tuple(side for side in all_dovetail_sides if is_inner[side])
+
+
+def _split_units(units: int, bed_length: float) -> list[int]:
+    """Split `units` into as few, as evenly sized tiles as fit `bed_length`."""
+    max_units = int(bed_length // grid_unit)
+    if max_units < 1:
+        raise ValueError(f"Bed length {bed_length} is smaller than one grid unit")
+
+    count = math.ceil(units / max_units)
+    size, remainder = divmod(units, count)
+
+    return [size + 1] * remainder + [size] * (count - remainder)
+
+
+def _build_tile_brep(spec: TileSpec, path: Path) -> Path:
+    spec.build().export_brep(str(path))
+    return path
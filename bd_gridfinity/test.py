@@ -32,3 +32,10 @@ bin = gf.Bin(
 show_object(bin, name="bin")
 
 # show_all()
+
+# %%
+# Build in the background instead. Re-running the cell with new arguments
+# cancels the stale build, and each part is shown as soon as it's done.
+# runner = bdu.BuildRunner(on_progress=print)
+# runner.submit("bin", gf.Bin, 2, 1, 4)
+# runner.submit("baseplate", gf.Baseplate, 4, 2)
@@ -0,0 +1,80 @@
+import bd_gridfinity as gf
+import bd_utils as bdu
+import pytest
+from bd_gridfinity import baseplate
+from build123d import *
+from OCP.TopAbs import TopAbs_FACE
+from OCP.TopExp import TopExp
+from OCP.TopTools import TopTools_IndexedMapOfShape
+
+
+def test_templates_are_kept_per_build_options():
+    default = baseplate._cell_template(("-x",), bdu.current_options().cache_inputs)
+    with bdu.build_options(fuzzy=1e-5):
+        fuzzy = baseplate._cell_template(("-x",), bdu.current_options().cache_inputs)
+
+    assert fuzzy is not default
+    assert fuzzy.volume == pytest.approx(default.volume)
+
+
+def test_base_grid_is_kept_per_build_options():
+    gf.bin._base_grid.cache_clear()
+    gf.Bin(1, 1, 2)
+    with bdu.build_options(heal=False):
+        gf.Bin(1, 1, 2)
+
+    assert gf.bin._base_grid.cache_info().currsize == 2
+
+
+def test_spec_components_build_cell_templates():
+    with bdu.build_options(fuzzy=1e-5):
+        [component] = gf.BaseplateSpec(1, 1, ["-x"]).components()
+
+    assert component.build() is baseplate._cell_template(("-x",), (1e-5, True))
+
+
+def test_spec_name_has_dovetail_sides():
+    assert gf.BaseplateSpec(2, 2).name == "baseplate_2x2"
+    assert gf.BaseplateSpec(2, 2, ["+x", "-x"]).name == "baseplate_2x2_-x_+x"
+    assert gf.BaseplateSpec(2, 2, []).name == "baseplate_2x2_none"
+
+
+def _face_count(part: Part) -> int:
+    # `Part.faces` dedupes by hash code, which now and then drops a face
+    faces = TopTools_IndexedMapOfShape()
+    TopExp.MapShapes_s(part.wrapped, TopAbs_FACE, faces)
+    return faces.Extent()
+
+
+def _assert_same_plate(part: Part, expected: Part):
+    assert part.volume == pytest.approx(expected.volume)
+    assert _face_count(part) == _face_count(expected)
+    # Bounding boxes are measured with a small tolerance
+    box, expected_box = part.bounding_box(), expected.bounding_box()
+    assert box.min.to_tuple() == pytest.approx(expected_box.min.to_tuple(), abs=1e-5)
+    assert box.max.to_tuple() == pytest.approx(expected_box.max.to_tuple(), abs=1e-5)
+
+
+@pytest.mark.parametrize(
+    "align, dovetail_sides",
+    [("**-", gf.all_dovetail_sides), ("---", ["-x", "+y"]), ("+*+", [])],
+)
+def test_compact_plate_matches_default(align: str, dovetail_sides: list[str]):
+    default = gf.Baseplate(3, 2, align=align, dovetail_sides=dovetail_sides)
+    with bdu.build_options(compact=True):
+        compact = gf.Baseplate(3, 2, align=align, dovetail_sides=dovetail_sides)
+
+    _assert_same_plate(compact, default)
+
+
+def test_compact_plate_in_builder_context():
+    parts = []
+    for compact in [False, True]:
+        with bdu.build_options(compact=compact):
+            with BuildPart() as builder:
+                with Locations((100, 0)):
+                    gf.Baseplate(2, 2)
+        parts.append(builder.part)
+
+    _assert_same_plate(parts[1], parts[0])
+    assert parts[1].bounding_box().center().X == pytest.approx(100)
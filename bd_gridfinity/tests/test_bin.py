@@ -0,0 +1,46 @@
+import bd_gridfinity as gf
+import bd_utils as bdu
+import pytest
+from bd_gridfinity.lazy import BinSpec
+
+
+@pytest.mark.parametrize("x_units, y_units", [(1, 1), (3, 2)])
+def test_stepped_lip_matches_sweep(x_units: int, y_units: int):
+    swept = gf.BinShell(x_units, y_units, 3, lip="sweep")
+    stepped = gf.BinShell(x_units, y_units, 3, lip="stepped")
+
+    assert stepped.volume == pytest.approx(swept.volume, rel=1e-6)
+    assert (swept - stepped).volume + (stepped - swept).volume < 1e-6
+    assert stepped.bounding_box().size.to_tuple() == pytest.approx(
+        swept.bounding_box().size.to_tuple()
+    )
+
+
+def test_spec_name_has_lip():
+    assert BinSpec(2, 1, 3).name == "bin_2x1x3"
+    assert BinSpec(2, 1, 3, lip="stepped").name == "bin_2x1x3_stepped"
+
+
+def test_first_bin_matches_rebuild_from_memoized_grid():
+    gf.bin._base_grid.cache_clear()
+    first = gf.Bin(2, 2, 2)
+    rebuilt = gf.Bin(2, 2, 2)
+
+    assert bdu.geometry_hash(first) == bdu.geometry_hash(rebuilt)
+
+
+def test_spec_edit_replays_only_magnet_stages(tmp_path, monkeypatch):
+    monkeypatch.setattr(bdu.part_cache, "path", tmp_path)
+    monkeypatch.setattr(bdu.part_cache, "enabled", True)
+    gf.BinBase()
+    assert len(bdu.part_cache.entries()) == 2
+
+    # An edit anywhere in the sources changes their fingerprint, but not the
+    # stages that don't read what changed
+    monkeypatch.setattr(gf.bin, "_source", "edited")
+    gf.BinBase()
+    assert len(bdu.part_cache.entries()) == 2
+
+    monkeypatch.setattr(gf.bin, "magnet_tolerance", gf.magnet_tolerance + 0.1)
+    gf.BinBase()
+    assert len(bdu.part_cache.entries()) == 3
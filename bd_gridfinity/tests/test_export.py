@@ -0,0 +1,22 @@
+import re
+import zipfile
+
+import bd_gridfinity as gf
+from bd_gridfinity.lazy import BaseplateSpec
+from build123d import *
+
+
+def test_export_bed_with_parts(tmp_path):
+    part = Box(20, 10, 5)
+    [bed] = gf.pack_beds([BaseplateSpec(1, 1), part, part])
+    path = gf.export_3mf(tmp_path / "bed.3mf", bed.items)
+
+    with zipfile.ZipFile(path) as archive:
+        model = archive.read("3D/3dmodel.model").decode()
+
+    part_ids = {
+        re.search(r'objectid="(\d+)"', item)[1]  # type: ignore
+        for item in re.findall(r"<item [^>]*>", model)
+    }
+    assert model.count("<item ") == 3
+    assert len(part_ids) == 2
@@ -0,0 +1,19 @@
+import pytest
+from bd_gridfinity.lazy import BinSpec, PartSpec
+
+
+def test_incomplete_spec_fails_on_creation():
+    class NamedSpec(PartSpec):
+        @property
+        def name(self) -> str:
+            return "named"
+
+    with pytest.raises(TypeError, match="abstract"):
+        NamedSpec()  # type: ignore
+
+
+def test_spec_dimensions_without_building():
+    spec = BinSpec(2, 1, 3)
+
+    assert spec.size[:2] == pytest.approx((83.5, 41.5))
+    assert "part" not in spec.__dict__
@@ -0,0 +1,20 @@
+import bd_utils as bdu
+import numpy as np
+import pytest
+from bd_gridfinity import BaseplateSpec
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [BaseplateSpec(1, 1), BaseplateSpec(2, 2), BaseplateSpec(3, 1, ["-x", "+y"])],
+    ids=lambda spec: spec.name,
+)
+def test_assembled_mesh_matches_plate(spec: BaseplateSpec):
+    mesh = spec.mesh()
+    exact = bdu.tessellate(spec.part)
+
+    assert mesh.is_watertight
+    np.testing.assert_allclose(mesh.bounds, exact.bounds, atol=1e-6)
+    low, high = mesh.bounds
+    np.testing.assert_allclose(high - low, spec.size, atol=1e-6)
+    assert mesh.volume == pytest.approx(exact.volume, rel=1e-6)
@@ -0,0 +1,41 @@
+import bd_gridfinity as gf
+import numpy as np
+import pytest
+from bd_gridfinity import lazy
+
+
+def _assert_matches(mesh, size, volume):
+    # Magnet hole fillets are left out, and arcs such as the lip's tip fillet
+    # are faceted
+    low, high = mesh.bounds
+    np.testing.assert_allclose(high - low, size, atol=1e-2)
+    assert mesh.volume == pytest.approx(volume, rel=2e-3)
+
+
+@pytest.mark.parametrize(
+    "preview, build",
+    [(gf.baseplate_unit_mesh, gf.BaseplateUnit), (gf.bin_base_mesh, gf.BinBase)],
+)
+def test_preview_matches_part(preview, build):
+    part = build()
+
+    _assert_matches(preview(), part.bounding_box().size.to_tuple(), part.volume)
+
+
+@pytest.mark.parametrize("x_units, y_units", [(1, 1), (2, 1), (3, 2)])
+def test_lip_preview_matches_shell(x_units: int, y_units: int):
+    shell = gf.BinShell(x_units, y_units, 3)
+    width, length, height = shell.bounding_box().size.to_tuple()
+    body_height = 3 * gf.height_unit - gf.bin.base_height
+    inset = gf.bin.wall_width
+    walls = lazy._rounded_rect_area(
+        width, length, gf.bin.corner_radius
+    ) * body_height - lazy._rounded_rect_area(
+        width - 2 * inset, length - 2 * inset, gf.bin.corner_radius - inset
+    ) * (body_height - inset)
+
+    _assert_matches(
+        gf.lip_mesh(x_units, y_units),
+        (width, length, height - body_height),
+        shell.volume - walls,
+    )
@@ -1,3 +1,12 @@
+from bd_utils.bench import *
 from bd_utils.builder import *
+from bd_utils.cache import *
 from bd_utils.debug import *
+from bd_utils.export import *
+from bd_utils.memory import *
+from bd_utils.mesh import *
+from bd_utils.options import *
+from bd_utils.profiling import *
+from bd_utils.runner import *
+from bd_utils.selectors import *
 from bd_utils.shorthand import *
@@ -0,0 +1,12 @@
+import sys
+
+from bd_utils.bench import bench_cli
+from bd_utils.cache import cache_cli
+
+match sys.argv[1:]:
+    case ["cache", *args]:
+        cache_cli(args)
+    case ["bench", *args]:
+        bench_cli(args)
+    case _:
+        raise SystemExit("usage: python -m bd_utils cache|bench ...")
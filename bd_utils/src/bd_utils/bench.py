@@ -0,0 +1,209 @@
+import json
+import platform
+import subprocess
+import sys
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable
+
+import build123d as bd
+
+from bd_utils.cache import package_version
+from bd_utils.memory import rss_bytes
+
+
+@dataclass
+class BenchResult:
+    name: str
+    seconds: float
+    """Fastest of `repeat` runs."""
+    mean_seconds: float
+    repeat: int
+    peak_rss_mb: float
+    """Peak resident memory of the process while the case ran."""
+    faces: int
+    edges: int
+    solids: int
+
+
+@dataclass
+class ImportResult:
+    module: str
+    seconds: float
+    """Fastest of `repeat` cold imports, each in a fresh interpreter."""
+    viewer_modules: list[str]
+    """Viewer modules that were loaded by the import, which should be none."""
+
+
+viewer_modules = ("ocp_vscode", "tkinter")
+
+
+class RssSampler:
+    """Track peak resident memory from a background thread while active."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self.peak = rss_bytes()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_bytes())
+
+    @property
+    def peak_mb(self) -> float:
+        return self.peak / 1024**2
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, rss_bytes())
+
+
+def run_bench(name: str, build: Callable[[], bd.Shape], repeat: int = 3) -> BenchResult:
+    times = []
+    with RssSampler() as sampler:
+        for _ in range(repeat):
+            start = perf_counter()
+            shape = build()
+            times.append(perf_counter() - start)
+
+    result = BenchResult(
+        name=name,
+        seconds=min(times),
+        mean_seconds=sum(times) / len(times),
+        repeat=repeat,
+        peak_rss_mb=sampler.peak_mb,
+        faces=len(shape.faces()),
+        edges=len(shape.edges()),
+        solids=len(shape.solids()),
+    )
+    print(
+        f"{name:<28} {result.seconds:8.3f}s (mean {result.mean_seconds:.3f}s)"
+        f" {result.peak_rss_mb:7.0f} MiB"
+        f" {result.faces:6} faces {result.edges:6} edges"
+    )
+
+    return result
+
+
+def measure_import(module: str, repeat: int = 3) -> ImportResult:
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "seconds = time.perf_counter() - start\n"
+        f"loaded = [name for name in {viewer_modules!r} if name in sys.modules]\n"
+        "print(json.dumps([seconds, loaded]))"
+    )
+    runs = [
+        json.loads(
+            subprocess.run(
+                [sys.executable, "-c", code],
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(repeat)
+    ]
+
+    result = ImportResult(
+        module=module,
+        seconds=min(seconds for seconds, _ in runs),
+        viewer_modules=runs[0][1],
+    )
+    print(
+        f"import {module:<21} {result.seconds:8.3f}s"
+        f"  viewer modules: {', '.join(result.viewer_modules) or 'none'}"
+    )
+
+    return result
+
+
+def save_results(
+    results: list[BenchResult], out_dir: Path | str, suite: str
+) -> Path:
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now()
+    path = out_dir / f"{suite}-{timestamp:%Y%m%d-%H%M%S}.json"
+    path.write_text(
+        json.dumps(
+            {
+                "suite": suite,
+                "timestamp": timestamp.isoformat(),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "build123d": package_version("build123d"),
+                "results": [asdict(result) for result in results],
+            },
+            indent=2,
+        )
+    )
+
+    return path
+
+
+def load_results(path: Path | str) -> dict[str, BenchResult]:
+    data: dict[str, Any] = json.loads(Path(path).read_text())
+    return {result["name"]: BenchResult(**result) for result in data["results"]}
+
+
+def find_regressions(
+    baseline: dict[str, BenchResult],
+    current: dict[str, BenchResult],
+    tolerance: float = 0.2,
+) -> list[str]:
+    """Describe every case that got slower or hungrier by more than `tolerance`."""
+    regressions = []
+    for name, result in current.items():
+        if name not in baseline:
+            continue
+
+        before = baseline[name]
+        for metric in ["seconds", "peak_rss_mb"]:
+            old, new = getattr(before, metric), getattr(result, metric)
+            if old > 0 and new > old * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {old:.3f} -> {new:.3f}")
+        if (before.faces, before.edges) != (result.faces, result.edges):
+            regressions.append(
+                f"{name}: topology {before.faces}/{before.edges}"
+                f" -> {result.faces}/{result.edges} faces/edges"
+            )
+
+    return regressions
+
+
+def bench_cli(args: list[str]) -> None:
+    match args:
+        case ["compare", baseline, current, *rest]:
+            tolerance = float(rest[0]) if rest else 0.2
+            regressions = find_regressions(
+                load_results(baseline), load_results(current), tolerance
+            )
+            for regression in regressions:
+                print(regression)
+            if regressions:
+                raise SystemExit(1)
+            print("No regressions")
+        case ["import", module, *rest]:
+            result = measure_import(module)
+            if result.viewer_modules:
+                raise SystemExit(f"{module} loaded viewer modules")
+            if rest and result.seconds > float(rest[0]):
+                raise SystemExit(f"{module} took longer than {rest[0]}s to import")
+        case _:
+            raise SystemExit(
+                "usage: python -m bd_utils bench compare BASELINE CURRENT [TOLERANCE]\n"
+                "       python -m bd_utils bench import MODULE [BUDGET_SECONDS]"
+            )
@@ -1,5 +1,12 @@
+from dataclasses import dataclass, field
+from typing import Iterable
+from weakref import WeakKeyDictionary
+
 import build123d as bd
 
+from bd_utils.memory import release_memory
+from bd_utils.selectors import fast_faces
+
 
 def get_part_or_fail() -> bd.BuildPart:
     part = bd.BuildPart._get_context("get_part_or_fail")
@@ -13,17 +20,159 @@ def axis_faces(
     axis: bd.Axis, part: bd.BuildPart | None = None
 ) -> bd.ShapeList[bd.Face]:
     part = part or get_part_or_fail()
+    index = _face_index(part)
+    key = _axis_key(axis)
+    if key not in index.sorted:
+        index.sorted[key] = index.filtered(axis).sort_by(axis)
 
-    return part.faces().filter_by(axis).sort_by(axis)
+    return bd.ShapeList(index.sorted[key])
 
 
 def axis_face_groups(
     axis: bd.Axis, part: bd.BuildPart | None = None
 ) -> list[bd.ShapeList[bd.Face]]:
     part = part or get_part_or_fail()
-    faces = part.faces().filter_by(axis).group_by(axis)
+    index = _face_index(part)
+    key = _axis_key(axis)
+    if key not in index.groups:
+        index.groups[key] = index.filtered(axis).group_by(axis)  # type: ignore
+
+    return [bd.ShapeList(group) for group in index.groups[key]]
+
+
+@dataclass
+class _FaceIndex:
+    """Face selections of one state of a builder's part, keyed by axis."""
+
+    shape: bd.Shape
+    shape_hash: int
+    faces_by_axis: dict[tuple, bd.ShapeList[bd.Face]] = field(default_factory=dict)
+    sorted: dict[tuple, bd.ShapeList[bd.Face]] = field(default_factory=dict)
+    groups: dict[tuple, list[bd.ShapeList[bd.Face]]] = field(default_factory=dict)
+
+    def filtered(self, axis: bd.Axis) -> bd.ShapeList[bd.Face]:
+        key = _axis_key(axis)
+        if key not in self.faces_by_axis:
+            self.faces_by_axis[key] = fast_faces(self.shape).filter_by(axis)
+
+        return self.faces_by_axis[key]
+
+
+_face_indexes: WeakKeyDictionary[bd.BuildPart, _FaceIndex] = WeakKeyDictionary()
+
+
+def _face_index(part: bd.BuildPart) -> _FaceIndex:
+    """The part's face index, rebuilt whenever the part has changed since."""
+    shape = part._obj
+    index = _face_indexes.get(part)
+    if index is None or index.shape is not shape or index.shape_hash != hash(shape):
+        index = _FaceIndex(shape, hash(shape))
+        _face_indexes[part] = index
+
+    return index
+
+
+def _axis_key(axis: bd.Axis) -> tuple:
+    return (axis.position.to_tuple(), axis.direction.to_tuple())
+
+
+def place_copies(
+    shape: bd.Shape, locations: Iterable[bd.Location]
+) -> list[bd.Solid]:
+    """Solids of `shape` placed at each of `locations`.
+
+    Copies share the underlying geometry of `shape` rather than deep copying it,
+    so placing many of them is cheap.
+    """
+    return [
+        bd.Solid(solid.wrapped.Moved(location.wrapped))
+        for location in locations
+        for solid in shape.solids()
+    ]
+
+
+def fuse_copies(
+    shape: bd.Shape,
+    locations: Iterable[bd.Location],
+    glue: bool = True,
+    batch: int | None = None,
+) -> bd.Shape:
+    """Place copies of `shape` at `locations` and fuse them in a single boolean.
+
+    `glue` assumes copies only touch at shared faces, which holds for grid
+    placements. With `batch`, copies are fused `batch` at a time, such as a
+    grid row, and then the batches, releasing memory after each. That lowers
+    the peak of large fuses at some cost in time.
+    """
+    locations = list(locations)
+    if batch is not None and len(locations) > batch:
+        batches = []
+        for start in range(0, len(locations), batch):
+            batches.append(fuse_copies(shape, locations[start : start + batch], glue))
+            release_memory()
+        [first, *rest] = batches
+    else:
+        [first, *rest] = place_copies(shape, locations)
+    if not rest:
+        return first
+
+    return first.fuse(*rest, glue=glue).clean()
+
+
+def grid_locations(
+    x_spacing: float, y_spacing: float, x_count: int, y_count: int
+) -> list[bd.Location]:
+    """The locations of a centered `GridLocations`, ignoring any enclosing
+    `Locations` context, which `GridLocations` applies when it's created outside
+    a builder.
+    """
+    return [
+        bd.Location(
+            ((x - (x_count - 1) / 2) * x_spacing, (y - (y_count - 1) / 2) * y_spacing)
+        )
+        for x in range(x_count)
+        for y in range(y_count)
+    ]
+
+
+def prealigned(
+    part: bd.Part,
+    align: tuple[bd.Align, bd.Align, bd.Align] | None,
+    bounds: tuple[bd.VectorLike, bd.VectorLike],
+) -> bd.Part:
+    """`part` aligned like `BasePartObject` does, but from its known (min, max)
+    `bounds` rather than measuring its bounding box, which is slow for large
+    parts. Pass the result to `BasePartObject` with `align=None`.
+
+    A part that's already aligned is returned as is, without even an identity
+    location, since `BasePartObject` deep copies it and copying a located part
+    takes more memory. Otherwise the part is moved, sharing its geometry, as
+    baking the offset into the geometry would take a copy of its own.
+    """
+    low, high = bd.Vector(bounds[0]), bd.Vector(bounds[1])
+    offset = [
+        {
+            bd.Align.MIN: -low_value,
+            bd.Align.CENTER: -(low_value + high_value) / 2,
+            bd.Align.MAX: -high_value,
+            None: 0,
+        }[axis_align]
+        for axis_align, low_value, high_value in zip(
+            align or (None, None, None), low.to_tuple(), high.to_tuple()
+        )
+    ]
+
+    if not any(offset):
+        return part
+
+    return bd.Part(part.wrapped.Moved(bd.Location(offset).wrapped))
+
+
+def as_part(shape: bd.Shape) -> bd.Part:
+    if isinstance(shape, bd.Compound):
+        return bd.Part(shape.wrapped)
 
-    return faces  # type: ignore
+    return bd.Part(bd.Compound.make_compound([shape]).wrapped)
 
 
 # def with_parent(builder: bd_common.Builder) -> bd_common.Builder:
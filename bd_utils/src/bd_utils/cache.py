@@ -0,0 +1,241 @@
+import hashlib
+import inspect
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from importlib import metadata
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Sequence
+
+import build123d as bd
+
+from bd_utils.builder import as_part
+from bd_utils.memory import commit_stage
+from bd_utils.options import current_options
+
+_default_dir = Path.home() / ".cache" / "bd_utils" / "parts"
+_default_max_bytes = 512 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    key: str
+    path: Path
+    size: int
+    last_used: datetime
+
+
+class PartCache:
+    """Content-addressed on-disk cache of built parts, stored as BREP.
+
+    Entries are keyed by a hash of whatever identifies the part (see `key`) and
+    evicted least-recently-used first once the cache grows past `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        path: Path | str = _default_dir,
+        max_bytes: int = _default_max_bytes,
+        enabled: bool = True,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+
+    @staticmethod
+    def key(*inputs: Any) -> str:
+        return hashlib.sha256(repr(inputs).encode()).hexdigest()
+
+    def get(self, key: str) -> bd.Part | None:
+        path = self._entry_path(key)
+        if not self.enabled or not path.exists():
+            return None
+
+        try:
+            shape = bd.import_brep(str(path))
+        except ValueError:
+            path.unlink(missing_ok=True)
+            return None
+
+        os.utime(path)
+        return as_part(shape)
+
+    def put(self, key: str, part: bd.Part) -> None:
+        if not self.enabled:
+            return
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        path = self._entry_path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        part.export_brep(str(tmp_path))
+        os.replace(tmp_path, path)
+
+        self.evict()
+
+    def get_or_build(self, key: str, build: Callable[[], bd.Part]) -> bd.Part:
+        part = self.get(key)
+        if part is None:
+            part = build()
+            self.put(key, part)
+
+        return part
+
+    def entries(self) -> list[CacheEntry]:
+        if not self.path.exists():
+            return []
+
+        entries = []
+        for path in self.path.glob("*.brep"):
+            stat = path.stat()
+            entries.append(
+                CacheEntry(
+                    key=path.stem,
+                    path=path,
+                    size=stat.st_size,
+                    last_used=datetime.fromtimestamp(stat.st_mtime),
+                )
+            )
+
+        return sorted(entries, key=lambda entry: entry.last_used, reverse=True)
+
+    def evict(self) -> None:
+        total = 0
+        for entry in self.entries():
+            total += entry.size
+            if total > self.max_bytes:
+                entry.path.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        for entry in self.entries():
+            entry.path.unlink(missing_ok=True)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.path / f"{key}.brep"
+
+
+part_cache = PartCache(
+    path=os.environ.get("BD_CACHE_DIR", _default_dir),
+    max_bytes=int(os.environ.get("BD_CACHE_MAX_BYTES", _default_max_bytes)),
+    enabled=os.environ.get("BD_CACHE", "1") != "0",
+)
+
+
+def cached_part(build: Callable[[], bd.Part], *inputs: Any) -> bd.Part:
+    """Build a part through the default `part_cache`.
+
+    `inputs` must fully determine the result of `build`, typically the part's
+    class, its constructor arguments and `source_fingerprint` of its modules.
+    """
+    return part_cache.get_or_build(
+        PartCache.key(*inputs, *current_options().cache_inputs), build
+    )
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One step of a staged build, see `build_stages`."""
+
+    name: str
+    apply: Callable[[], Any]
+    """Runs inside a `BuildPart` that already holds the previous stage's part."""
+    inputs: Sequence[str] = ()
+    """Names of the module level constants `apply` and its `helpers` read."""
+    helpers: Sequence[Callable | property] = ()
+    """Functions and properties `apply` calls, whose source is hashed with it."""
+
+    def key(self, previous: str) -> str:
+        namespace = getattr(self.apply, "__globals__", {})
+        return PartCache.key(
+            previous,
+            self.name,
+            [
+                inspect.getsource(getattr(function, "fget", function))
+                for function in [self.apply, *self.helpers]
+            ],
+            [(name, namespace[name]) for name in self.inputs],
+        )
+
+
+def build_stages(stages: Sequence[Stage], *inputs: Any) -> bd.Part:
+    """Build a part stage by stage, caching the part after every stage.
+
+    Each stage's key chains the key before it with the source of the stage and
+    its helpers and the values of its declared inputs, so changing a constant
+    replays only the stages from the first one that reads it. Only the latest
+    cached stage is loaded. `inputs` identify the part, such as its class and
+    arguments, and are part of every stage's key. Unlike `cached_part`, they
+    shouldn't include a `source_fingerprint`, which would replay every stage
+    on any edit to the module. Each stage runs in its own builder, whether or
+    not the cache is enabled, so cached and uncached builds match.
+    """
+    label = inputs[0] if inputs else "part"
+    keys = []
+    key = PartCache.key(
+        package_version("build123d"), *inputs, *current_options().cache_inputs
+    )
+    for stage in stages:
+        key = stage.key(key)
+        keys.append(key)
+
+    part = None
+    start = 0
+    for index in reversed(range(len(stages))):
+        part = part_cache.get(keys[index])
+        if part is not None:
+            start = index + 1
+            break
+
+    for stage, key in zip(stages[start:], keys[start:]):
+        with bd.BuildPart() as builder:
+            if part is not None:
+                bd.add(part)
+            stage.apply()
+
+        part = builder.part
+        part_cache.put(key, part)
+        del builder
+        commit_stage(f"{label}.{stage.name}")
+
+    return as_part(part)  # type: ignore
+
+
+def source_fingerprint(*modules: ModuleType) -> str:
+    """Hash of the given modules' source and their package versions.
+
+    Covers module level constants and step tables as well as the build code
+    itself, so editing any of them invalidates cached parts.
+    """
+    digest = hashlib.sha256()
+    digest.update(package_version("build123d").encode())
+    for module in modules:
+        digest.update(package_version(module.__name__.split(".")[0]).encode())
+        digest.update(Path(module.__file__ or "").read_bytes())
+
+    return digest.hexdigest()
+
+
+def package_version(package: str) -> str:
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def cache_cli(args: list[str]) -> None:
+    command = args[0] if args else "info"
+    match command:
+        case "info":
+            entries = part_cache.entries()
+            total = sum(entry.size for entry in entries)
+            print(f"{part_cache.path}: {len(entries)} parts, {total / 1024**2:.1f} MiB")
+            for entry in entries:
+                print(
+                    f"  {entry.key[:16]}  {entry.size / 1024:8.1f} KiB"
+                    f"  {entry.last_used:%Y-%m-%d %H:%M}"
+                )
+        case "clear":
+            part_cache.clear()
+            print(f"Cleared {part_cache.path}")
+        case _:
+            raise SystemExit(f"Unknown command {command}, expected info or clear")
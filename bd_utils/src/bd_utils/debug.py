@@ -1,11 +1,132 @@
+import hashlib
+import io
+import re
+from dataclasses import dataclass, field
+from types import ModuleType
 from typing import Any
 
 import build123d as bd
-import ocp_vscode as ocp
+from OCP.BRepTools import BRepTools
+from OCP.TopoDS import TopoDS_Shape
+from OCP.TopTools import TopTools_FormatVersion
 
 _to_show: list[tuple[Any, str | None]] = []
 
 
+@dataclass
+class ShowDiff:
+    added: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+class ShowSession:
+    """Shows named objects, skipping the viewer when none of them changed.
+
+    `ocp_vscode` replaces its scene on each show, so every current object is
+    sent whenever any was added, changed or removed. Shapes are kept by
+    geometry hash, and an unchanged or rebuilt object is swapped for the shape
+    sent before, which already carries the viewer's triangulation, so only the
+    changed objects are tessellated again.
+
+    `viewer` needs `reset_show`, `push_object`, `show_objects` and `show_clear`
+    like `ocp_vscode`, which is used by default.
+    """
+
+    def __init__(self, viewer: Any = None, max_shapes: int = 64):
+        self._viewer = viewer
+        self.max_shapes = max_shapes
+        self.hashes: dict[str, str] = {}
+        self._shapes: dict[str, Any] = {}
+
+    @property
+    def viewer(self) -> Any:
+        return self._viewer or _viewer()
+
+    def show(self, objects: dict[str, Any]) -> ShowDiff:
+        hashes = {name: geometry_hash(obj) for name, obj in objects.items()}
+        diff = ShowDiff(
+            added=[name for name in hashes if name not in self.hashes],
+            changed=[
+                name
+                for name in hashes
+                if name in self.hashes and hashes[name] != self.hashes[name]
+            ],
+            removed=[name for name in self.hashes if name not in hashes],
+        )
+        if not diff:
+            return diff
+
+        viewer = self.viewer
+        viewer.reset_show()
+        for name, obj in objects.items():
+            viewer.push_object(self._cached_shape(hashes[name], obj), name)
+        if objects:
+            viewer.show_objects()
+        else:
+            viewer.show_clear()
+
+        self.hashes = hashes
+        return diff
+
+    def clear(self):
+        """Forget what the viewer shows, keeping the shapes cached by hash."""
+        self.hashes = {}
+
+    def _cached_shape(self, key: str, obj: Any) -> Any:
+        shape = self._shapes.pop(key, obj)
+        self._shapes[key] = shape
+        if len(self._shapes) > self.max_shapes:
+            del self._shapes[next(iter(self._shapes))]
+
+        return shape
+
+
+_session = ShowSession()
+_number = re.compile(rb"-?\d+(?:\.\d*)?(?:e[-+]?\d+)?")
+
+
+def geometry_hash(obj: Any) -> str:
+    """Hash of a shape's geometry and placement, equal for identical rebuilds.
+
+    Rebuilds can differ in the last bits of a float, so coordinates are hashed
+    to 10 significant digits, treating those within 1e-9 of zero as zero, and
+    regardless of padding. Builders hash their current object. Anything that
+    isn't a shape hashes by identity, so it is unchanged only while it is the
+    same object.
+    """
+    if isinstance(obj, (bd.BuildPart, bd.BuildSketch, bd.BuildLine)):
+        obj = obj._obj
+    if isinstance(obj, (list, tuple)):
+        return hashlib.sha256(
+            "".join(geometry_hash(item) for item in obj).encode()
+        ).hexdigest()
+
+    wrapped = getattr(obj, "wrapped", None)
+    if not isinstance(wrapped, TopoDS_Shape):
+        return f"id:{id(obj)}"
+
+    stream = io.BytesIO()
+    BRepTools.Write_s(
+        wrapped,
+        stream,
+        False,
+        False,
+        TopTools_FormatVersion.TopTools_FormatVersion_CURRENT,
+    )
+    tokens = stream.getvalue().split()
+    rounded = b" ".join(_number.sub(_round, token) for token in tokens)
+    return hashlib.sha256(rounded).hexdigest()
+
+
+def _round(match: re.Match) -> bytes:
+    value = float(match[0])
+    return b"0" if abs(value) < 1e-9 else b"%.10g" % value
+
+
 def init_show(
     axes=True,
     axes0=True,
@@ -17,7 +138,9 @@ def init_show(
 ):
     global _to_show
     _to_show = []
+    _session.clear()
 
+    ocp = _viewer()
     ocp.reset_show()
     ocp.show_clear()
     ocp.set_defaults(
@@ -32,14 +155,14 @@ def init_show(
 
 
 def reset_camera():
-    ocp.set_defaults(reset_camera=True)
+    _viewer().set_defaults(reset_camera=True)
 
 
 def add_show(cad_obj: Any, name: str | None = None):
     _to_show.append((cad_obj, name))
 
 
-def show_selected():
+def show_selected() -> ShowDiff:
     import inspect
 
     locals = inspect.currentframe().f_back.f_locals  # type: ignore
@@ -52,21 +175,42 @@ def show_selected():
         except Exception:
             return None
 
-    ocp.show(
-        *[obj for obj, _ in _to_show],
-        names=[get_name(obj) or name for obj, name in _to_show],
+    return _session.show(
+        _unique_names(
+            [(get_name(obj) or name, obj) for obj, name in _to_show],
+        )
     )
 
 
-
 def show_labeled():
     pass
 
 
-def show_builders():
+def show_builders() -> ShowDiff:
+    import inspect
+
+    locals = inspect.currentframe().f_back.f_locals  # type: ignore
     show_classes = (bd.BuildPart, bd.BuildSketch, bd.BuildLine)
-    to_show = [kv for kv in locals().items() if isinstance(kv[1], show_classes)]
-    ocp.show(
-        *[value for (_, value) in to_show],
-        names=[name for (name, _) in to_show],
-    )
+    builders = {
+        name: value for name, value in locals.items() if isinstance(value, show_classes)
+    }
+    return _session.show(builders)
+
+
+def _unique_names(named: list[tuple[str | None, Any]]) -> dict[str, Any]:
+    objects: dict[str, Any] = {}
+    for name, obj in named:
+        name = name or type(obj).__name__
+        unique, index = name, 1
+        while unique in objects:
+            unique, index = f"{name}({index})", index + 1
+        objects[unique] = obj
+
+    return objects
+
+
+def _viewer() -> ModuleType:
+    """Import the viewer on first use, so headless imports of bd_utils skip it."""
+    import ocp_vscode
+
+    return ocp_vscode
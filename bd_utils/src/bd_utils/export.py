@@ -0,0 +1,192 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from multiprocessing import get_context
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Literal, Sequence, TypeAlias
+
+import build123d as bd
+
+from bd_utils.cache import PartCache
+from bd_utils.debug import geometry_hash
+
+# skipped parts weren't built, unchanged ones were rebuilt to the geometry
+# already in their files, so the files were left alone
+ExportStatus: TypeAlias = Literal["skipped", "unchanged", "written"]
+
+
+@dataclass(frozen=True)
+class ExportEntry:
+    inputs: str
+    """Hash of everything the part was built from."""
+    geometry: str
+    """`geometry_hash` of the part the file was written from."""
+
+
+@dataclass(frozen=True)
+class ExportJob:
+    """A part and the files to export it to, by suffix: STEP, STL or BREP.
+
+    `inputs` must fully determine the part, as for `cached_part`. To run in a
+    process pool, `build` must be picklable, such as a `partial` of a part class.
+    """
+
+    files: tuple[str, ...]
+    build: Callable[[], bd.Part]
+    inputs: tuple[Any, ...]
+
+
+@dataclass
+class ExportResult:
+    files: tuple[str, ...]
+    status: ExportStatus
+    entry: ExportEntry
+    written: list[str] = field(default_factory=list)
+    seconds: float = 0
+
+
+def export_parts(
+    jobs: Sequence[ExportJob],
+    out_dir: Path | str,
+    workers: int | None = 1,
+    manifest: str = "exports.json",
+) -> list[ExportResult]:
+    """Export parts whose inputs changed since the last export to `out_dir`.
+
+    The manifest records each file's input hash and geometry hash. Parts with
+    unchanged inputs aren't built, and rebuilt parts whose geometry matches the
+    manifest aren't rewritten. Parts are exported in a process pool if
+    `workers` != 1.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / manifest
+    previous = read_manifest(manifest_path)
+
+    # Skip current parts here, so they don't wait for a worker to start
+    results: dict[int, ExportResult] = {}
+    stale = []
+    for index, job in enumerate(jobs):
+        inputs = PartCache.key(*job.inputs)
+        if is_current(out_dir, job.files, inputs, previous):
+            results[index] = ExportResult(job.files, "skipped", previous[job.files[0]])
+        else:
+            stale.append(index)
+
+    if workers == 1 or len(stale) < 2:
+        exported = [_export_job(jobs[index], out_dir, previous) for index in stale]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),
+        ) as pool:
+            exported = list(
+                pool.map(
+                    _export_job,
+                    [jobs[index] for index in stale],
+                    [out_dir] * len(stale),
+                    [previous] * len(stale),
+                )
+            )
+    results.update(zip(stale, exported))
+
+    entries = dict(previous)
+    for result in results.values():
+        entries.update({file: result.entry for file in result.files})
+    write_manifest(manifest_path, entries)
+
+    return [results[index] for index in range(len(jobs))]
+
+
+def export_part(
+    build: Callable[[], bd.Part],
+    out_dir: Path,
+    files: Sequence[str],
+    inputs: str,
+    previous: dict[str, ExportEntry],
+) -> tuple[ExportStatus, ExportEntry, list[str]]:
+    """Build and write `files` unless `previous` shows they're current.
+
+    Returns the status, the new manifest entry for the files and the files
+    that were written.
+    """
+    if is_current(out_dir, files, inputs, previous):
+        return "skipped", previous[files[0]], []
+
+    old = [previous.get(file) for file in files]
+    part = build()
+    entry = ExportEntry(inputs, geometry_hash(part))
+    written = []
+    for file, old_entry in zip(files, old):
+        path = out_dir / file
+        if not (path.exists() and old_entry and old_entry.geometry == entry.geometry):
+            write_export(part, path)
+            written.append(file)
+
+    return ("written" if written else "unchanged"), entry, written
+
+
+def is_current(
+    out_dir: Path,
+    files: Sequence[str],
+    inputs: str,
+    previous: dict[str, ExportEntry],
+) -> bool:
+    """Whether every file exists and was exported from the same inputs."""
+    return all(
+        file in previous
+        and previous[file].inputs == inputs
+        and (out_dir / file).exists()
+        for file in files
+    )
+
+
+def write_export(part: bd.Shape, path: Path | str) -> Path:
+    """Export by suffix through a temporary file, so readers never see a partial
+    file."""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.tmp{path.suffix}")
+    match path.suffix.lower():
+        case ".step" | ".stp":
+            part.export_step(str(tmp_path))
+        case ".stl":
+            part.export_stl(str(tmp_path))
+        case ".brep":
+            part.export_brep(str(tmp_path))
+        case suffix:
+            raise ValueError(f"Can't export {suffix} files")
+    if not tmp_path.exists():
+        raise RuntimeError(f"Failed to write {path}")
+    os.replace(tmp_path, path)
+
+    return path
+
+
+def read_manifest(path: Path) -> dict[str, ExportEntry]:
+    if not path.exists():
+        return {}
+
+    return {
+        file: ExportEntry(**entry)
+        for file, entry in json.loads(path.read_text()).items()
+    }
+
+
+def write_manifest(path: Path, entries: dict[str, ExportEntry]) -> None:
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(
+        json.dumps({file: asdict(entry) for file, entry in entries.items()}, indent=2)
+    )
+    os.replace(tmp_path, path)
+
+
+def _export_job(
+    job: ExportJob, out_dir: Path, previous: dict[str, ExportEntry]
+) -> ExportResult:
+    start = perf_counter()
+    status, entry, written = export_part(
+        job.build, out_dir, job.files, PartCache.key(*job.inputs), previous
+    )
+    return ExportResult(job.files, status, entry, written, perf_counter() - start)
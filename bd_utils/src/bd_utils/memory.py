@@ -0,0 +1,153 @@
+import ctypes
+import gc
+import os
+import resource
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Iterator
+
+from bd_utils.options import current_options
+
+
+@dataclass
+class MemorySample:
+    stage: str
+    seconds: float
+    """Time since profiling started."""
+    python_mb: float
+    """Python heap in use after the stage, as traced by `tracemalloc`."""
+    python_peak_mb: float
+    """Largest Python heap during the stage."""
+    rss_mb: float
+    """Resident memory after the stage, including OCC's native allocations."""
+    rss_peak_mb: float
+    """Largest resident memory during the stage, sampled every few milliseconds."""
+
+
+class MemoryProfile:
+    """Memory after each build stage, recorded by `commit_stage`."""
+
+    def __init__(self, interval: float = 0.005):
+        self.samples: list[MemorySample] = []
+        self.start = perf_counter()
+        self.start_rss_mb = rss_bytes() / 1024**2
+        self.interval = interval
+        self._rss_peak = rss_bytes()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample_rss, daemon=True)
+        self._thread.start()
+
+    def summary(self) -> str:
+        lines = ["   time   python     peak      rss     peak  stage"]
+        for sample in self.samples:
+            lines.append(
+                f"{sample.seconds:7.2f} {sample.python_mb:8.1f}"
+                f" {sample.python_peak_mb:8.1f} {sample.rss_mb:8.1f}"
+                f" {sample.rss_peak_mb:8.1f}  {sample.stage}"
+            )
+        lines.append(f"from {self.start_rss_mb:.1f} MiB rss, peak {peak_rss_mb():.1f}")
+
+        return "\n".join(lines)
+
+    def _record(self, stage: str):
+        python, python_peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        rss = rss_bytes()
+        rss_peak, self._rss_peak = max(self._rss_peak, rss), rss
+        self.samples.append(
+            MemorySample(
+                stage,
+                perf_counter() - self.start,
+                python / 1024**2,
+                python_peak / 1024**2,
+                rss / 1024**2,
+                rss_peak / 1024**2,
+            )
+        )
+
+    def _stop_sampling(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _sample_rss(self):
+        while not self._stop.wait(self.interval):
+            self._rss_peak = max(self._rss_peak, rss_bytes())
+
+
+_memory: MemoryProfile | None = None
+
+
+@contextmanager
+def profile_memory(print_summary: bool = True) -> Iterator[MemoryProfile]:
+    """Record Python heap and resident memory after every stage committed inside
+    the context. `tracemalloc` slows pure Python code down while it runs."""
+    global _memory
+    if _memory is not None:
+        raise RuntimeError("profile_memory is already active")
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    _memory = MemoryProfile()
+    try:
+        yield _memory
+    finally:
+        profile, _memory = _memory, None
+        profile._stop_sampling()
+        if not was_tracing:
+            tracemalloc.stop()
+        if print_summary:
+            print(profile.summary(), file=sys.stderr)
+
+
+def commit_stage(stage: str) -> None:
+    """Mark a stage of a build as done.
+
+    With `build_options(compact=True)` whatever the stage left behind is freed
+    and handed back to the OS, at the cost of a garbage collection per stage.
+    Shapes and their selections reference each other, so without this they
+    wait for the next full collection.
+    """
+    if current_options().compact:
+        release_memory()
+
+    if _memory is not None:
+        _memory._record(stage)
+
+
+def release_memory() -> None:
+    """Collect garbage, then return freed heap pages to the OS where possible."""
+    gc.collect()
+    if _malloc_trim is not None:
+        _malloc_trim(0)
+
+
+def rss_bytes() -> int:
+    """Current resident memory, or the peak so far where that isn't available."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return int(peak_rss_mb() * 1024**2)
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def _load_malloc_trim():
+    """glibc's `malloc_trim`, which other platforms don't have."""
+    try:
+        return ctypes.CDLL(None).malloc_trim
+    except (AttributeError, OSError):
+        return None
+
+
+_malloc_trim = _load_malloc_trim()
@@ -0,0 +1,295 @@
+import io
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+from xml.sax.saxutils import escape
+
+import build123d as bd
+import numpy as np
+from OCP.BRep import BRep_Tool
+from OCP.TopAbs import TopAbs_FACE, TopAbs_Orientation
+from OCP.TopExp import TopExp
+from OCP.TopLoc import TopLoc_Location
+from OCP.TopoDS import TopoDS
+from OCP.TopTools import TopTools_IndexedMapOfShape
+
+
+@dataclass
+class Mesh:
+    vertices: np.ndarray
+    """(n, 3) float coordinates."""
+    triangles: np.ndarray
+    """(m, 3) vertex indices, counter-clockwise seen from outside."""
+
+    @property
+    def volume(self) -> float:
+        a, b, c = (self.vertices[self.triangles[:, i]] for i in range(3))
+        return float(np.einsum("ij,ij->i", a, np.cross(b, c)).sum() / 6)
+
+    @property
+    def bounds(self) -> tuple[np.ndarray, np.ndarray]:
+        return self.vertices.min(axis=0), self.vertices.max(axis=0)
+
+    @property
+    def is_watertight(self) -> bool:
+        """Whether every edge joins exactly two triangles with opposite winding."""
+        edges = self.triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+        directed, counts = np.unique(edges, axis=0, return_counts=True)
+        if (counts != 1).any():
+            return False
+
+        reversed_edges = np.unique(edges[:, ::-1], axis=0)
+        return len(directed) == len(reversed_edges) and bool(
+            (directed == reversed_edges).all()
+        )
+
+    def instanced(self, offsets: np.ndarray) -> "Mesh":
+        """Copies of the mesh translated by each of the (k, 3) `offsets`."""
+        offsets = np.asarray(offsets, dtype=float).reshape(-1, 1, 3)
+        vertices = (self.vertices[np.newaxis] + offsets).reshape(-1, 3)
+        shifts = np.arange(len(offsets)).reshape(-1, 1, 1) * len(self.vertices)
+        triangles = (self.triangles[np.newaxis] + shifts).reshape(-1, 3)
+
+        return Mesh(vertices, triangles)
+
+    def without_plane(self, axis: int, value: float, tolerance: float = 1e-6) -> "Mesh":
+        """Drop the triangles lying in the plane where coordinate `axis` is `value`."""
+        on_plane = np.abs(self.vertices[:, axis] - value) <= tolerance
+        keep = ~on_plane[self.triangles].all(axis=1)
+
+        return _compact(Mesh(self.vertices, self.triangles[keep]))
+
+    def write_stl(self, path: Path | str) -> Path:
+        """Write a binary STL."""
+        path = Path(path)
+        corners = self.vertices[self.triangles].astype(np.float32)
+        normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        normals = np.divide(
+            normals, lengths, out=np.zeros_like(normals), where=lengths > 0
+        )
+
+        records = np.zeros(
+            len(self.triangles),
+            dtype=[("normal", "<f4", 3), ("corners", "<f4", (3, 3)), ("attr", "<u2")],
+        )
+        records["normal"] = normals
+        records["corners"] = corners
+        with open(path, "wb") as file:
+            file.write(b"\0" * 80)
+            file.write(np.uint32(len(records)).tobytes())
+            file.write(records.tobytes())
+
+        return path
+
+
+def merge(meshes: Iterable[Mesh], weld_tolerance: float = 1e-6) -> Mesh:
+    """Concatenate meshes and weld the vertices they share along their seams."""
+    meshes = list(meshes)
+    offsets = np.cumsum([0] + [len(mesh.vertices) for mesh in meshes[:-1]])
+    mesh = Mesh(
+        np.concatenate([mesh.vertices for mesh in meshes]),
+        np.concatenate(
+            [mesh.triangles + offset for mesh, offset in zip(meshes, offsets)]
+        ),
+    )
+
+    return weld(mesh, weld_tolerance)
+
+
+def tessellate(
+    shape: bd.Shape,
+    tolerance: float = 0.01,
+    angular_tolerance: float = 0.1,
+    weld_tolerance: float = 1e-6,
+) -> Mesh:
+    """Triangulate `shape`, welding the vertices that faces share on their edges.
+
+    Like `Shape.tessellate`, but collects nodes straight into arrays and
+    merges the duplicate vertices each face adds along its boundary. Faces are
+    collected in an indexed map rather than with `Shape.faces`, which dedupes
+    by a truncated hash code and can drop a face whose hash collides.
+    """
+    shape.mesh(tolerance, angular_tolerance)
+
+    faces = TopTools_IndexedMapOfShape()
+    TopExp.MapShapes_s(shape.wrapped, TopAbs_FACE, faces)
+
+    vertices: list[np.ndarray] = []
+    triangles: list[np.ndarray] = []
+    offset = 0
+    for index in range(1, faces.Extent() + 1):
+        face = TopoDS.Face_s(faces.FindKey(index))
+        location = TopLoc_Location()
+        poly = BRep_Tool.Triangulation_s(face, location)
+        if poly is None:
+            continue
+
+        transform = location.Transformation()
+        nodes = np.array(
+            [
+                poly.Node(i).Transformed(transform).Coord()
+                for i in range(1, poly.NbNodes() + 1)
+            ],
+            dtype=float,
+        )
+        face_triangles = np.array(
+            [poly.Triangle(i).Get() for i in range(1, poly.NbTriangles() + 1)],
+            dtype=np.int64,
+        ).reshape(-1, 3)
+        if face.Orientation() == TopAbs_Orientation.TopAbs_REVERSED:
+            face_triangles = face_triangles[:, [0, 2, 1]]
+
+        vertices.append(nodes)
+        triangles.append(face_triangles - 1 + offset)
+        offset += len(nodes)
+
+    if not vertices:
+        return Mesh(np.empty((0, 3)), np.empty((0, 3), dtype=np.int64))
+
+    mesh = Mesh(np.concatenate(vertices), np.concatenate(triangles))
+    return weld(mesh, weld_tolerance)
+
+
+def weld(mesh: Mesh, tolerance: float = 1e-6) -> Mesh:
+    """Merge vertices closer than `tolerance` and drop collapsed triangles."""
+    keys = np.round(mesh.vertices / tolerance).astype(np.int64)
+    _, first, inverse = np.unique(
+        keys, axis=0, return_index=True, return_inverse=True
+    )
+    triangles = inverse.reshape(-1)[mesh.triangles]
+    is_degenerate = (
+        (triangles[:, 0] == triangles[:, 1])
+        | (triangles[:, 1] == triangles[:, 2])
+        | (triangles[:, 0] == triangles[:, 2])
+    )
+
+    return _compact(Mesh(mesh.vertices[first], triangles[~is_degenerate]))
+
+
+def _compact(mesh: Mesh) -> Mesh:
+    """Drop vertices that no triangle uses."""
+    used, triangles = np.unique(mesh.triangles, return_inverse=True)
+    return Mesh(mesh.vertices[used], triangles.reshape(-1, 3))
+
+
+_content_types = """<?xml version="1.0" encoding="UTF-8"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+ <Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+ <Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>
+</Types>
+"""
+_relationships = """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+ <Relationship Target="/3D/3dmodel.model" Id="rel0" Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>
+</Relationships>
+"""
+
+
+class ThreeMFWriter:
+    """Stream a 3MF file with shared mesh resources and instanced components.
+
+    Every mesh is written to the archive as soon as it is added, so only one
+    mesh is held in memory at a time. Identical geometry should be added once
+    with `add_mesh` and referenced by transform from `add_components` and
+    `add_item`.
+    """
+
+    def __init__(self, path: Path | str, unit: str = "millimeter"):
+        self.path = Path(path)
+        self.unit = unit
+        self._next_id = 1
+        self._items: list[str] = []
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._zip = zipfile.ZipFile(self.path, "w", zipfile.ZIP_DEFLATED)
+        self._zip.writestr("[Content_Types].xml", _content_types)
+        self._zip.writestr("_rels/.rels", _relationships)
+        self._model = io.TextIOWrapper(
+            self._zip.open("3D/3dmodel.model", "w", force_zip64=True),
+            encoding="utf-8",
+        )
+        self._model.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<model unit="{self.unit}" xml:lang="en-US"'
+            ' xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">\n'
+            "<resources>\n"
+        )
+        return self
+
+    def __exit__(self, *_):
+        self._model.write("</resources>\n<build>\n")
+        self._model.writelines(self._items)
+        self._model.write("</build>\n</model>\n")
+        self._model.close()
+        self._zip.close()
+
+    def add_mesh(self, mesh: Mesh, name: str | None = None) -> int:
+        object_id = self._start_object(name)
+        write = self._model.write
+
+        write("<mesh>\n<vertices>\n")
+        for chunk in np.array_split(
+            mesh.vertices, max(1, len(mesh.vertices) // 4096)
+        ):
+            write(
+                "".join(
+                    f'<vertex x="{x:.5f}" y="{y:.5f}" z="{z:.5f}"/>\n'
+                    for x, y, z in chunk.tolist()
+                )
+            )
+        write("</vertices>\n<triangles>\n")
+        for chunk in np.array_split(
+            mesh.triangles, max(1, len(mesh.triangles) // 4096)
+        ):
+            write(
+                "".join(
+                    f'<triangle v1="{a}" v2="{b}" v3="{c}"/>\n'
+                    for a, b, c in chunk.tolist()
+                )
+            )
+        write("</triangles>\n</mesh>\n</object>\n")
+
+        return object_id
+
+    def add_components(
+        self,
+        components: Iterable[tuple[int, bd.Location]],
+        name: str | None = None,
+    ) -> int:
+        """An object made of earlier objects, each placed by a transform."""
+        object_id = self._start_object(name)
+        self._model.write("<components>\n")
+        for component_id, location in components:
+            self._model.write(
+                f'<component objectid="{component_id}"'
+                f' transform="{_transform(location)}"/>\n'
+            )
+        self._model.write("</components>\n</object>\n")
+
+        return object_id
+
+    def add_item(self, object_id: int, location: bd.Location | None = None):
+        """Place an object on the build plate."""
+        transform = "" if location is None else f' transform="{_transform(location)}"'
+        self._items.append(f'<item objectid="{object_id}"{transform}/>\n')
+
+    def _start_object(self, name: str | None) -> int:
+        object_id = self._next_id
+        self._next_id += 1
+        name_attribute = "" if name is None else f' name="{escape(name)}"'
+        self._model.write(f'<object id="{object_id}" type="model"{name_attribute}>\n')
+
+        return object_id
+
+
+def _transform(location: bd.Location) -> str:
+    """The 3MF row-major 4x3 matrix of a location."""
+    transform = location.wrapped.Transformation()
+    values = [
+        transform.Value(row, column) for column in range(1, 5) for row in range(1, 4)
+    ]
+
+    return " ".join(f"{value:.6g}" for value in values)
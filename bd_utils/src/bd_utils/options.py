@@ -0,0 +1,114 @@
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Union
+
+import build123d as bd
+from OCP.BOPAlgo import BOPAlgo_Options
+from OCP.BRepAlgoAPI import BRepAlgoAPI_BooleanOperation, BRepAlgoAPI_Splitter
+from OCP.TopTools import TopTools_ListOfShape
+
+
+@dataclass(frozen=True)
+class BuildOptions:
+    parallel: bool = True
+    """Run booleans on OCC's thread pool, one thread per core."""
+    fuzzy: float = 0
+    """Tolerance under which booleans treat faces and edges as coincident."""
+    heal: bool = True
+    """Check results with `Shape.fix` and booleans for inverted solids. Only
+    turn this off for inputs known to be valid."""
+    compact: bool = False
+    """Free each stage's intermediate shapes as soon as it's committed, see
+    `commit_stage`."""
+
+    @property
+    def cache_inputs(self) -> tuple:
+        """The options that can change a built part, for cache keys."""
+        if (self.fuzzy, self.heal) == (_default.fuzzy, _default.heal):
+            return ()
+        return (self.fuzzy, self.heal)
+
+
+_default = BuildOptions()
+_current = _default
+
+
+def current_options() -> BuildOptions:
+    """The options booleans currently run with."""
+    return _current
+
+
+@contextmanager
+def build_options(
+    parallel: bool = True,
+    fuzzy: float = 0,
+    heal: bool = True,
+    compact: bool = False,
+) -> Iterator[BuildOptions]:
+    """Run every boolean inside the context with these options.
+
+    This covers builder modes like `Mode.SUBTRACT` as well as direct calls to
+    `fuse`, `cut`, `intersect` and `split`. `compact` trades time for memory
+    between build stages instead. Contexts nest, restoring the outer options on
+    exit. Cached parts are keyed on `fuzzy` and `heal`, since both can change
+    the result.
+    """
+    global _current
+    previous, _current = _current, BuildOptions(parallel, fuzzy, heal, compact)
+    restore = _patch() if previous is _default else lambda: None
+    parallel_mode = BOPAlgo_Options.GetParallelMode_s()
+    BOPAlgo_Options.SetParallelMode_s(parallel)
+    try:
+        yield _current
+    finally:
+        BOPAlgo_Options.SetParallelMode_s(parallel_mode)
+        _current = previous
+        restore()
+
+
+def _bool_op(
+    self: bd.Shape,
+    args: Iterable[bd.Shape],
+    tools: Iterable[bd.Shape],
+    operation: Union[BRepAlgoAPI_BooleanOperation, BRepAlgoAPI_Splitter],
+) -> bd.Shape:
+    """`Shape._bool_op` with the current options instead of its fixed ones."""
+    arg = TopTools_ListOfShape()
+    for obj in args:
+        arg.Append(obj.wrapped)
+
+    tool = TopTools_ListOfShape()
+    for obj in tools:
+        tool.Append(obj.wrapped)
+
+    operation.SetArguments(arg)
+    operation.SetTools(tool)
+
+    operation.SetRunParallel(_current.parallel)
+    if _current.fuzzy > 0:
+        operation.SetFuzzyValue(_current.fuzzy)
+    if not _current.heal and isinstance(operation, BRepAlgoAPI_BooleanOperation):
+        operation.SetCheckInverted(False)
+    operation.Build()
+
+    return bd.Shape.cast(operation.Shape())
+
+
+def _fix(self: bd.Shape) -> bd.Shape:
+    """`Shape.fix`, skipping its validity check when healing is off."""
+    return _original_fix(self) if _current.heal else self
+
+
+_original_fix = bd.Shape.fix
+
+
+def _patch():
+    original_bool_op = bd.Shape.__dict__["_bool_op"]
+    bd.Shape._bool_op = _bool_op  # type: ignore
+    bd.Shape.fix = _fix  # type: ignore
+
+    def restore():
+        bd.Shape._bool_op = original_bool_op  # type: ignore
+        bd.Shape.fix = _original_fix  # type: ignore
+
+    return restore
@@ -0,0 +1,245 @@
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Iterator
+
+import build123d as bd
+from build123d import build_common
+
+_operations = [
+    "add",
+    "chamfer",
+    "extrude",
+    "fillet",
+    "loft",
+    "make_face",
+    "mirror",
+    "offset",
+    "revolve",
+    "split",
+    "sweep",
+]
+_methods: list[tuple[type, list[str]]] = [
+    (
+        bd.Shape,
+        ["fuse", "cut", "intersect", "clean", "bounding_box"]
+        + ["faces", "edges", "vertices"],
+    ),
+    (bd.Compound, ["fuse", "cut", "intersect"]),
+    (build_common.Builder, ["faces", "edges", "vertices"]),
+    (bd.ShapeList, ["filter_by", "sort_by", "group_by", "sort_by_distance"]),
+]
+
+
+@dataclass
+class OpEvent:
+    stack: tuple[str, ...]
+    start: float
+    seconds: float
+    thread: int
+    faces: int | None = None
+    """Faces in the result, or the number of items for selectors."""
+
+
+@dataclass
+class _OpStats:
+    calls: int = 0
+    seconds: float = 0
+    child_seconds: float = 0
+    faces: int = 0
+    children: dict[str, "_OpStats"] = field(default_factory=dict)
+
+
+class OpProfile:
+    """Wall time, call counts and result sizes of build123d operations."""
+
+    def __init__(self, on_event: Callable[[OpEvent], None] | None = None):
+        self.events: list[OpEvent] = []
+        self.start = perf_counter()
+        self.on_event = on_event
+        """Called with each event as its operation finishes."""
+        self._local = threading.local()
+
+    def summary(self, min_seconds: float = 0.001) -> str:
+        """Flame-style tree of operations, nested by the call stack."""
+        root = _OpStats()
+        for event in self.events:
+            stats = root
+            for name in event.stack:
+                stats = stats.children.setdefault(name, _OpStats())
+            stats.calls += 1
+            stats.seconds += event.seconds
+            stats.faces += event.faces or 0
+            if len(event.stack) > 1:
+                parent = root
+                for name in event.stack[:-1]:
+                    parent = parent.children[name]
+                parent.child_seconds += event.seconds
+
+        lines = ["   total     self  calls   faces  operation"]
+
+        def add_lines(children: dict[str, _OpStats], depth: int):
+            for name, stats in sorted(
+                children.items(), key=lambda item: -item[1].seconds
+            ):
+                if stats.seconds < min_seconds:
+                    continue
+                lines.append(
+                    f"{stats.seconds:8.3f} {stats.seconds - stats.child_seconds:8.3f}"
+                    f" {stats.calls:6} {stats.faces:7}  {'  ' * depth}{name}"
+                )
+                add_lines(stats.children, depth + 1)
+
+        add_lines(root.children, 0)
+        return "\n".join(lines)
+
+    def write_chrome_trace(self, path: Path | str) -> Path:
+        """Write events in the Chrome trace format, for chrome://tracing or Perfetto."""
+        path = Path(path)
+        trace_events = [
+            {
+                "name": event.stack[-1],
+                "ph": "X",
+                "ts": (event.start - self.start) * 1e6,
+                "dur": event.seconds * 1e6,
+                "pid": os.getpid(),
+                "tid": event.thread,
+                "args": {"faces": event.faces},
+            }
+            for event in self.events
+        ]
+        path.write_text(json.dumps({"traceEvents": trace_events}))
+
+        return path
+
+    def _wrap(self, name: str, fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            stack: list[str] = self._stack
+            if stack and stack[-1] is _counting:
+                return fn(*args, **kwargs)
+
+            stack.append(name)
+            start = perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                seconds = perf_counter() - start
+                event = OpEvent(tuple(stack), start, seconds, threading.get_ident())
+                stack.pop()
+                self.events.append(event)
+
+            stack.append(_counting)
+            try:
+                event.faces = _result_size(result)
+                if self.on_event is not None:
+                    self.on_event(event)
+            finally:
+                stack.pop()
+
+            return result
+
+        return wrapper
+
+    @property
+    def _stack(self) -> list[str]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+
+_counting = "<counting>"
+_active: OpProfile | None = None
+
+
+@contextmanager
+def profile_ops(
+    chrome_trace: Path | str | None = None,
+    print_summary: bool = True,
+    on_event: Callable[[OpEvent], None] | None = None,
+) -> Iterator[OpProfile]:
+    """Record every build123d operation and selector called inside the context.
+
+    Operations are patched in `build123d` and in every module that imported
+    them, and restored on exit. Set `BD_PROFILE=1` to profile a whole run, or
+    `BD_PROFILE=trace.json` to also write a Chrome trace.
+    """
+    global _active
+    if _active is not None:
+        raise RuntimeError("profile_ops is already active")
+
+    profile = OpProfile(on_event)
+    restore = _patch(profile)
+    _active = profile
+    try:
+        yield profile
+    finally:
+        restore()
+        _active = None
+        if print_summary:
+            print(profile.summary(), file=sys.stderr)
+        if chrome_trace is not None:
+            profile.write_chrome_trace(chrome_trace)
+
+
+def _patch(profile: OpProfile) -> Callable[[], None]:
+    originals: dict[int, tuple[Callable, Callable]] = {}
+    for name in _operations:
+        fn = getattr(bd, name)
+        originals[id(fn)] = (fn, profile._wrap(name, fn))
+
+    patched_modules = []
+    for module in list(sys.modules.values()):
+        namespace = getattr(module, "__dict__", None)
+        if namespace is None or module is sys.modules[__name__]:
+            continue
+        for key, value in list(namespace.items()):
+            if callable(value) and id(value) in originals:
+                original, wrapper = originals[id(value)]
+                if value is original:
+                    namespace[key] = wrapper
+                    patched_modules.append((namespace, key, original))
+
+    patched_methods = []
+    for cls, names in _methods:
+        for name in names:
+            method = cls.__dict__[name]
+            setattr(cls, name, profile._wrap(f"{cls.__name__}.{name}", method))
+            patched_methods.append((cls, name, method))
+
+    def restore():
+        for namespace, key, original in patched_modules:
+            namespace[key] = original
+        for cls, name, method in patched_methods:
+            setattr(cls, name, method)
+
+    return restore
+
+
+def _result_size(result: Any) -> int | None:
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, bd.Shape):
+        return len(result.faces())
+    return None
+
+
+def _profile_from_env():
+    setting = os.environ.get("BD_PROFILE")
+    if not setting or setting == "0":
+        return
+
+    chrome_trace = None if setting == "1" else setting
+    context = profile_ops(chrome_trace=chrome_trace)
+    context.__enter__()
+    atexit.register(context.__exit__, None, None, None)
+
+
+_profile_from_env()
@@ -0,0 +1,224 @@
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass
+from multiprocessing import get_context
+from multiprocessing.connection import Connection, wait
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable
+
+import build123d as bd
+
+from bd_utils.builder import as_part
+from bd_utils.debug import ShowSession
+from bd_utils.profiling import OpEvent, _operations, profile_ops
+
+
+@dataclass
+class BuildProgress:
+    name: str
+    stage: str
+    """The build123d operation that just finished, such as `extrude`."""
+    index: int
+    """How many operations the build has finished, counting this one."""
+    seconds: float
+    """Time since the build started."""
+
+
+class BuildRunner:
+    """Builds parts in worker processes, keeping only the newest build per name.
+
+    Each build runs in its own process, started ahead of time so build123d is
+    already imported when a build arrives. Submitting a name that is still
+    building terminates its worker, since OCC can't be interrupted from Python.
+    Finished parts are shown through `session` as they arrive, and
+    `on_progress` is called from a background thread with each builder
+    operation, such as `extrude` or `fillet`, as the worker finishes it.
+    Failures are kept in `errors`, including workers that crash and parts that
+    can't be shown.
+
+    Build functions and their arguments are pickled, so they must be
+    importable, such as part classes from a package.
+    """
+
+    def __init__(
+        self,
+        session: ShowSession | None = None,
+        on_progress: Callable[[BuildProgress], None] | None = None,
+    ):
+        self.session = session or ShowSession()
+        self.on_progress = on_progress
+        self.results: dict[str, bd.Part] = {}
+        self.errors: dict[str, str] = {}
+        self.progress: dict[str, BuildProgress] = {}
+
+        self._tmp_dir = Path(tempfile.mkdtemp(prefix="bd_runner_"))
+        self._context = get_context("spawn")
+        self._condition = threading.Condition()
+        self._busy: dict[str, _Job] = {}
+        self._spare = self._start_worker()
+        self._generation = 0
+        self._closed = False
+        self._listener = threading.Thread(target=self._listen, daemon=True)
+        self._listener.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def submit(self, name: str, build: Callable[..., bd.Part], *args, **kwargs):
+        """Build `build(*args, **kwargs)` as `name`, cancelling any stale build."""
+        with self._condition:
+            self.cancel(name)
+            self._generation += 1
+            path = self._tmp_dir / f"{self._generation}.brep"
+            worker, self._spare = self._spare, self._start_worker()
+            worker.conn.send((build, args, kwargs, str(path)))
+            self._busy[name] = _Job(worker, path, perf_counter())
+            self.errors.pop(name, None)
+            self._condition.notify_all()
+
+    def cancel(self, name: str | None = None):
+        """Stop the build of `name`, or of every name."""
+        with self._condition:
+            names = list(self._busy) if name is None else [name]
+            for name in names:
+                job = self._busy.pop(name, None)
+                if job is not None:
+                    job.worker.stop()
+                    job.path.unlink(missing_ok=True)
+            self._condition.notify_all()
+
+    def wait(self, timeout: float | None = None) -> dict[str, bd.Part]:
+        """Block until every submitted build has finished or failed."""
+        with self._condition:
+            self._condition.wait_for(lambda: not self._busy, timeout)
+            return dict(self.results)
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self.cancel()
+            self._spare.stop()
+        self._listener.join()
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+    def _start_worker(self) -> "_Worker":
+        conn, child_conn = self._context.Pipe()
+        process = self._context.Process(target=_work, args=(child_conn,), daemon=True)
+        process.start()
+        child_conn.close()
+
+        return _Worker(process, conn)
+
+    def _listen(self):
+        while True:
+            with self._condition:
+                if self._closed:
+                    return
+                jobs = {
+                    job.worker.conn: (name, job) for name, job in self._busy.items()
+                }
+                if not jobs:
+                    self._condition.wait(0.1)
+                    continue
+
+            try:
+                ready = wait(list(jobs), timeout=0.1)
+            except (OSError, ValueError):
+                continue  # a worker was cancelled while waiting
+
+            for conn in ready:
+                name, job = jobs[conn]
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    # Cancelled, which `_handle` ignores, or the worker died
+                    # without a word, such as from a crash in OCC
+                    job.worker.process.join(1)
+                    exitcode = job.worker.process.exitcode
+                    message = ("error", f"Worker exited with code {exitcode}")
+
+                self._handle(name, job, message)
+
+    def _handle(self, name: str, job: "_Job", message: tuple):
+        kind, *values = message
+        with self._condition:
+            if self._busy.get(name) is not job:
+                return  # superseded while the message was in flight
+
+            if kind == "progress":
+                stage, index = values
+                self.progress[name] = BuildProgress(
+                    name, stage, index, perf_counter() - job.start
+                )
+                if self.on_progress is not None:
+                    self.on_progress(self.progress[name])
+                return
+
+            results = dict(self.results)
+
+        error = values[0] if kind == "error" else None
+        if kind == "done":
+            # Show outside the lock, so slow tessellation doesn't block submit
+            try:
+                results[name] = as_part(bd.import_brep(str(job.path)))
+                self.session.show(results)
+            except Exception as exception:
+                error = _describe(exception)
+
+        with self._condition:
+            if self._busy.get(name) is not job:
+                return
+
+            del self._busy[name]
+            job.worker.stop()
+            job.path.unlink(missing_ok=True)
+            if name in results:
+                self.results[name] = results[name]
+            if error is not None:
+                self.errors[name] = error
+            self._condition.notify_all()
+
+
+@dataclass
+class _Worker:
+    process: Any
+    conn: Connection
+
+    def stop(self):
+        self.process.terminate()
+        self.conn.close()
+
+
+@dataclass
+class _Job:
+    worker: _Worker
+    path: Path
+    start: float
+
+
+def _work(conn: Connection):
+    build, args, kwargs, path = conn.recv()
+    index = 0
+
+    def send_progress(event: OpEvent):
+        nonlocal index
+        if len(event.stack) == 1 and event.stack[0] in _operations:
+            index += 1
+            conn.send(("progress", event.stack[0], index))
+
+    try:
+        with profile_ops(print_summary=False, on_event=send_progress):
+            part = build(*args, **kwargs)
+        part.export_brep(path)
+        conn.send(("done",))
+    except Exception as error:
+        conn.send(("error", _describe(error)))
+
+
+def _describe(error: Exception) -> str:
+    return f"{type(error).__name__}: {error}"
@@ -0,0 +1,183 @@
+from functools import cached_property, partial
+from typing import Iterable, TypeVar
+
+import build123d as bd
+import numpy as np
+from build123d import build_common
+
+T = TypeVar("T", bound=bd.Shape)
+
+
+class _ShapeArrays:
+    """Centers and directions of a snapshot of shapes, extracted once, lazily."""
+
+    def __init__(self, shapes: list[bd.Shape]):
+        self.shapes = shapes
+
+    @cached_property
+    def centers(self) -> np.ndarray:
+        return np.array(
+            [shape.center().to_tuple() for shape in self.shapes], dtype=float
+        ).reshape(-1, 3)
+
+    @cached_property
+    def directions(self) -> np.ndarray:
+        """Normals of planar faces and tangents of linear edges, NaN otherwise."""
+        directions = np.full((len(self.shapes), 3), np.nan)
+        for i, shape in enumerate(self.shapes):
+            if isinstance(shape, bd.Face) and shape.geom_type() == "PLANE":
+                directions[i] = shape.normal_at(None).to_tuple()
+            elif isinstance(shape, bd.Edge) and shape.geom_type() == "LINE":
+                directions[i] = shape.tangent_at(0).to_tuple()
+
+        return directions
+
+
+class FastShapeList(bd.ShapeList[T]):
+    """A `ShapeList` whose axis selectors run vectorized over NumPy arrays.
+
+    Centers and directions are extracted once per snapshot and shared by every
+    list derived from it, so chained and repeated selections cost array
+    operations rather than a Python call per shape. Selectors that aren't
+    vectorized fall back to `ShapeList`.
+    """
+
+    def __init__(
+        self,
+        shapes: Iterable[T] = (),
+        arrays: _ShapeArrays | None = None,
+        indices: np.ndarray | None = None,
+    ):
+        super().__init__(shapes)
+        self._arrays = arrays or _ShapeArrays(list(self))
+        self._indices = np.arange(len(self)) if indices is None else indices
+
+    def filter_by(self, filter_by, reverse: bool = False, tolerance: float = 1e-5):
+        if not isinstance(filter_by, bd.Axis):
+            return super().filter_by(filter_by, reverse, tolerance)
+
+        directions = self._arrays.directions[self._indices]
+        dots = np.abs(directions @ _direction(filter_by))
+        with np.errstate(invalid="ignore"):
+            is_parallel = np.arccos(np.clip(dots, -1, 1)) <= tolerance
+        if reverse:
+            is_parallel = ~is_parallel
+
+        return self._take(np.flatnonzero(is_parallel))
+
+    def sort_by(self, sort_by=bd.Axis.Z, reverse: bool = False):
+        if not isinstance(sort_by, bd.Axis):
+            return super().sort_by(sort_by, reverse)
+
+        # A stable sort of negated keys keeps ties in order, like `sorted`
+        positions = self._positions(sort_by)
+        order = np.argsort(-positions if reverse else positions, kind="stable")
+        return self._take(order)
+
+    def group_by(self, group_by=bd.Axis.Z, reverse=False, tol_digits=6):
+        if not isinstance(group_by, bd.Axis):
+            return super().group_by(group_by, reverse, tol_digits)
+
+        # Rounded keys and a stable sort, like `ShapeList.group_by`
+        keys = np.round(self._positions(group_by), tol_digits)
+        order = np.argsort(-keys if reverse else keys, kind="stable")
+        splits = np.flatnonzero(np.diff(keys[order])) + 1
+        groups = [indices for indices in np.split(order, splits) if len(indices)]
+
+        return _GroupBy(
+            partial(_axis_key, group_by.location.inverse(), tol_digits),
+            [float(keys[indices[0]]) for indices in groups],
+            [self._take(indices) for indices in groups],
+        )
+
+    def sort_by_distance(self, other, reverse: bool = False):
+        if isinstance(other, bd.Shape) or not all(
+            isinstance(shape, bd.Vertex) for shape in self
+        ):
+            return super().sort_by_distance(other, reverse)
+
+        centers = self._arrays.centers[self._indices]
+        distances = np.linalg.norm(centers - _point(other), axis=1)
+        order = np.argsort(-distances if reverse else distances, kind="stable")
+        return self._take(order)
+
+    def _positions(self, axis: bd.Axis) -> np.ndarray:
+        centers = self._arrays.centers[self._indices]
+        return (centers - axis.position.to_tuple()) @ _direction(axis)
+
+    def _take(self, order: np.ndarray) -> "FastShapeList[T]":
+        indices = self._indices[order]
+        shapes = self._arrays.shapes
+
+        return FastShapeList(
+            [shapes[i] for i in indices],
+            arrays=self._arrays,
+            indices=indices,
+        )
+
+
+class _GroupBy(bd.GroupBy):
+    """A `GroupBy` of groups that are already split and sorted."""
+
+    def __init__(self, key_f, keys: list, groups: list[bd.ShapeList]):
+        self.key_f = key_f
+        self.groups = groups
+        self.key_to_group_index = [(key, index) for index, key in enumerate(keys)]
+
+
+def _axis_key(axis_location: bd.Location, tol_digits: int, shape: bd.Shape) -> float:
+    """`ShapeList.group_by`'s key for a shape along an axis."""
+    position = axis_location * bd.Location(shape.center())
+    return round(position.position.Z, tol_digits)
+
+
+class _Snapshots(dict[str, "FastShapeList"]):
+    """Selections of a shape, kept on the shape itself. Its shapes point back to
+    it through `topo_parent`, which would keep it alive as a weak dictionary
+    key. The selections are of the shape at `shape_hash`, which covers its
+    location, so they're dropped once it's moved in place. Copies of the shape
+    start without selections.
+    """
+
+    def __init__(self, shape_hash: int):
+        super().__init__()
+        self.shape_hash = shape_hash
+
+    def __copy__(self) -> "_Snapshots":
+        return _Snapshots(self.shape_hash)
+
+    def __deepcopy__(self, memo) -> "_Snapshots":
+        return _Snapshots(self.shape_hash)
+
+
+def fast_faces(obj: bd.Shape | build_common.Builder) -> FastShapeList[bd.Face]:
+    return _select(obj, "faces")
+
+
+def fast_edges(obj: bd.Shape | build_common.Builder) -> FastShapeList[bd.Edge]:
+    return _select(obj, "edges")
+
+
+def fast_vertices(obj: bd.Shape | build_common.Builder) -> FastShapeList[bd.Vertex]:
+    return _select(obj, "vertices")
+
+
+def _select(obj: bd.Shape | build_common.Builder, kind: str) -> FastShapeList:
+    """Shapes of `kind` in the current state of `obj`, shared per snapshot."""
+    shape = obj._obj if isinstance(obj, build_common.Builder) else obj
+    selections = shape.__dict__.get("_fast_selections")
+    if selections is None or selections.shape_hash != hash(shape):
+        selections = shape.__dict__["_fast_selections"] = _Snapshots(hash(shape))
+    if kind not in selections:
+        selections[kind] = FastShapeList(getattr(shape, kind)())
+
+    snapshot = selections[kind]
+    return FastShapeList(snapshot._arrays.shapes, snapshot._arrays, snapshot._indices)
+
+
+def _direction(axis: bd.Axis) -> np.ndarray:
+    return np.array(axis.direction.normalized().to_tuple())
+
+
+def _point(point: bd.VectorLike) -> np.ndarray:
+    return np.array(bd.Vector(point).to_tuple())
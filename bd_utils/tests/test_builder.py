@@ -0,0 +1,29 @@
+import bd_utils as bdu
+import pytest
+from build123d import *
+
+
+def test_batched_fuse_matches_single_fuse():
+    locations = bdu.grid_locations(10, 10, 3, 4)
+    single = bdu.fuse_copies(Box(10, 10, 2), locations)
+    batched = bdu.fuse_copies(Box(10, 10, 2), locations, batch=4)
+
+    assert len(batched.solids()) == 1
+    assert batched.volume == pytest.approx(single.volume)
+    assert len(batched.faces()) == len(single.faces())
+
+
+def test_prealigned_leaves_centered_part_unlocated():
+    part = bdu.as_part(Box(10, 10, 2))
+    bounds = ((-5, -5, -1), (5, 5, 1))
+
+    assert bdu.prealigned(part, bdu.align3("***"), bounds) is part
+
+
+def test_prealigned_moves_part_without_copying_it():
+    part = bdu.as_part(Box(10, 10, 2))
+    moved = bdu.prealigned(part, bdu.align3("**-"), ((-5, -5, -1), (5, 5, 1)))
+
+    assert moved.bounding_box().min.Z == pytest.approx(0, abs=1e-6)
+    assert moved.location.position.Z == pytest.approx(1)
+    assert moved.wrapped.IsPartner(part.wrapped)
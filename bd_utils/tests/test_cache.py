@@ -0,0 +1,69 @@
+import math
+
+import bd_utils as bdu
+import pytest
+from build123d import *
+
+length = 10.0
+hole_radius = 2.0
+
+
+def add_box():
+    Box(length, length, 5)
+
+
+def cut_hole():
+    Cylinder(hole_radius, 5, mode=Mode.SUBTRACT)
+
+
+stages = [
+    bdu.Stage("box", add_box, ("length",)),
+    bdu.Stage("hole", cut_hole, ("hole_radius",)),
+]
+
+
+@pytest.fixture
+def part_cache(tmp_path, monkeypatch) -> bdu.PartCache:
+    monkeypatch.setattr(bdu.part_cache, "path", tmp_path)
+    monkeypatch.setattr(bdu.part_cache, "enabled", True)
+    return bdu.part_cache
+
+
+def test_stages_replay_from_changed_input(part_cache: bdu.PartCache, monkeypatch):
+    bdu.build_stages(stages, "plate", "source")
+    monkeypatch.setitem(globals(), "hole_radius", 3.0)
+    part = bdu.build_stages(stages, "plate", "source")
+
+    assert len(part_cache.entries()) == 3
+    assert part.volume == pytest.approx(500 - math.pi * 3.0**2 * 5)
+
+
+def test_inputs_change_every_stage_key(part_cache: bdu.PartCache):
+    bdu.build_stages(stages, "plate", "source")
+    bdu.build_stages(stages, "other plate", "source")
+
+    assert len(part_cache.entries()) == 4
+
+
+def hole_size():
+    return hole_radius
+
+
+def test_stage_keys_cover_helper_source():
+    plain = bdu.Stage("hole", cut_hole, ("hole_radius",))
+    helped = bdu.Stage("hole", cut_hole, ("hole_radius",), (hole_size,))
+    with_property = bdu.Stage(
+        "hole", cut_hole, ("hole_radius",), (property(hole_size),)
+    )
+
+    assert plain.key("") != helped.key("")
+    assert helped.key("") == with_property.key("")
+
+
+def test_uncached_stages_match_cached(part_cache: bdu.PartCache, monkeypatch):
+    cached = bdu.build_stages(stages, "plate", "source")
+    monkeypatch.setattr(part_cache, "enabled", False)
+    uncached = bdu.build_stages(stages, "plate", "source")
+
+    assert uncached.volume == pytest.approx(cached.volume)
+    assert len(uncached.faces()) == len(cached.faces())
@@ -0,0 +1,77 @@
+import bd_utils as bdu
+import pytest
+from build123d import *
+
+
+class StackViewer:
+    """Records what is shown with `ocp_vscode`'s semantics: `push_object`
+    appends to the stack, and `show_objects` replaces the scene with it.
+    """
+
+    def __init__(self):
+        self.stack: list[tuple[str, object]] = []
+        self.scene: dict[str, object] = {}
+        self.shows = 0
+
+    def reset_show(self):
+        self.stack = []
+
+    def push_object(self, obj, name=None):
+        self.stack.append((name, obj))
+
+    def show_objects(self):
+        self.scene = dict(self.stack)
+        self.shows += 1
+
+    def show_clear(self):
+        self.scene = {}
+        self.shows += 1
+
+
+@pytest.fixture
+def viewer() -> StackViewer:
+    return StackViewer()
+
+
+def test_show_keeps_unchanged_objects_in_scene(viewer: StackViewer):
+    session = bdu.ShowSession(viewer)
+    box = Box(1, 2, 3)
+    session.show({"box": box, "ball": Sphere(1)})
+    ball = Sphere(2)
+    diff = session.show({"box": Box(1, 2, 3), "ball": ball})
+
+    assert diff.changed == ["ball"]
+    assert viewer.scene == {"box": box, "ball": ball}
+
+
+def test_show_skips_unchanged_rebuilds(viewer: StackViewer):
+    session = bdu.ShowSession(viewer)
+    session.show({"box": Box(1, 2, 3)})
+    diff = session.show({"box": Box(1, 2, 3)})
+
+    assert not diff
+    assert viewer.shows == 1
+
+
+def test_show_adds_and_removes_objects(viewer: StackViewer):
+    session = bdu.ShowSession(viewer)
+    session.show({"box": Box(1, 2, 3)})
+    session.show({"box": Box(1, 2, 3), "ball": Sphere(1)})
+    assert list(viewer.scene) == ["box", "ball"]
+
+    diff = session.show({"ball": Sphere(1)})
+    assert diff.removed == ["box"]
+    assert list(viewer.scene) == ["ball"]
+
+    session.show({})
+    assert viewer.scene == {}
+
+
+def test_show_reuses_shapes_by_geometry(viewer: StackViewer):
+    session = bdu.ShowSession(viewer)
+    first = Box(1, 2, 3)
+    session.show({"box": first})
+    session.show({"box": Box(2, 2, 3)})
+    session.show({"box": Box(1, 2, 3)})
+
+    assert viewer.scene == {"box": first}
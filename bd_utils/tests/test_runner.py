@@ -0,0 +1,57 @@
+import os
+from functools import partial
+
+import bd_utils as bdu
+import pytest
+from build123d import *
+
+# Workers import builds by module, which test modules can't be under importlib
+box = partial(Box, 1, 2, 3)
+crash = partial(os._exit, 3)
+
+
+class FailingSession:
+    def show(self, objects):
+        raise RuntimeError("no viewer")
+
+
+class RecordingSession:
+    def __init__(self):
+        self.shown: list[list[str]] = []
+
+    def show(self, objects):
+        self.shown.append(list(objects))
+
+
+@pytest.fixture
+def session() -> RecordingSession:
+    return RecordingSession()
+
+
+def test_builds_and_shows(session: RecordingSession):
+    with bdu.BuildRunner(session) as runner:  # type: ignore
+        runner.submit("box", box)
+        results = runner.wait(60)
+
+    assert results["box"].volume == pytest.approx(6)
+    assert session.shown == [["box"]]
+    assert not runner.errors
+
+
+def test_worker_crash_fails_the_build(session: RecordingSession):
+    with bdu.BuildRunner(session) as runner:  # type: ignore
+        runner.submit("crash", crash)
+        runner.submit("box", box)
+        results = runner.wait(60)
+
+    assert list(results) == ["box"]
+    assert runner.errors == {"crash": "Worker exited with code 3"}
+
+
+def test_show_failure_is_reported():
+    with bdu.BuildRunner(FailingSession()) as runner:  # type: ignore
+        runner.submit("box", box)
+        results = runner.wait(60)
+
+    assert results["box"].volume == pytest.approx(6)
+    assert runner.errors == {"box": "RuntimeError: no viewer"}
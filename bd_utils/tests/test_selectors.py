@@ -0,0 +1,71 @@
+import bd_utils as bdu
+import pytest
+from build123d import *
+from build123d.topology import GroupBy
+
+
+@pytest.fixture(scope="module")
+def part() -> Part:
+    holed = Box(10, 10, 5) - Pos(0, 0, 2) * Cylinder(2, 5)
+    return holed + Pos(7, 0, 0) * Box(2, 2, 3)
+
+
+def _hashes(groups) -> list[list[int]]:
+    return [[shape.hash_code() for shape in group] for group in groups]
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+@pytest.mark.parametrize("axis", [Axis.Z, Axis.X, Axis((1, 2, 3), (0, 1, 1))])
+def test_group_by_matches_shape_list(part: Part, axis: Axis, reverse: bool):
+    expected = part.edges().group_by(axis, reverse=reverse)
+    groups = bdu.fast_edges(part).group_by(axis, reverse=reverse)
+
+    assert isinstance(groups, GroupBy)
+    assert _hashes(groups) == _hashes(expected)
+    assert groups.key_to_group_index == expected.key_to_group_index
+    assert groups.group_for(groups[-1][0]) is groups[-1]
+
+
+def test_group_by_rounds_chained_positions():
+    # Each vertex is within the tolerance of the next, but not of the first
+    vertices = Compound.make_compound([Vertex(0, 0, z * 4e-7) for z in range(4)])
+    groups = bdu.fast_vertices(vertices).group_by(Axis.Z, tol_digits=6)
+
+    assert len(groups) == len(vertices.vertices().group_by(Axis.Z, tol_digits=6))
+    assert len(groups) == 2
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_sort_by_keeps_ties_in_order(part: Part, reverse: bool):
+    expected = part.faces().sort_by(Axis.Z, reverse=reverse)
+    faces = bdu.fast_faces(part).sort_by(Axis.Z, reverse=reverse)
+
+    assert _hashes([faces]) == _hashes([expected])
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_sort_by_distance_keeps_ties_in_order(part: Part, reverse: bool):
+    expected = part.vertices().sort_by_distance((0, 0, 0), reverse=reverse)
+    vertices = bdu.fast_vertices(part).sort_by_distance((0, 0, 0), reverse=reverse)
+
+    assert _hashes([vertices]) == _hashes([expected])
+
+
+def test_selections_follow_shapes_moved_in_place():
+    box = Box(1, 1, 1, align=(Align.MIN, Align.MIN, Align.MIN))
+    assert bdu.fast_faces(box).sort_by(Axis.X)[0].center().X == pytest.approx(0)
+
+    box.move(Pos(10, 0, 0))
+    [face, *_] = bdu.fast_faces(box).sort_by(Axis.X)
+
+    assert face.center().X == pytest.approx(10)
+    assert face.center() == box.faces().sort_by(Axis.X)[0].center()
+
+
+def test_axis_faces_follow_parts_moved_in_place():
+    with BuildPart() as builder:
+        Box(1, 1, 1)
+        assert bdu.axis_faces(Axis.Z)[-1].center().Z == pytest.approx(0.5)
+
+        builder.part.move(Pos(0, 0, 10))
+        assert bdu.axis_faces(Axis.Z)[-1].center().Z == pytest.approx(10.5)
@@ -0,0 +1,10 @@
+import bd_utils as bdu
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def no_part_cache():
+    """Build every part, rather than loading it from the user's part cache."""
+    enabled, bdu.part_cache.enabled = bdu.part_cache.enabled, False
+    yield
+    bdu.part_cache.enabled = enabled
@@ -0,0 +1,38 @@
+# %%
+from pathlib import Path
+from time import perf_counter
+
+import bd_utils as bdu
+import stand
+
+# Time real builds, not BREP loads. Sweep workers import this module too.
+bdu.part_cache.enabled = False
+
+# %%
+# Suite: time, peak memory and topology of each stand half, saved as JSON.
+# Compare two runs with `python -m bd_utils bench compare OLD.json NEW.json`.
+if __name__ == "__main__":
+    results = [
+        bdu.run_bench(
+            f"stand {side.name.replace('_', ' ')}",
+            lambda side=side: stand.StandHalf(stand.StandParams(), side),
+        )
+        for side in stand.sides
+    ]
+    print(bdu.save_results(results, Path("bench_results"), "uhk"))
+
+# %%
+# Sweep: both halves for each tent angle and width, across a process pool.
+if __name__ == "__main__":
+    start = perf_counter()
+    sweep = stand.sweep(tent=[-20, -25, -30], tilt=[0, -3], width=[110, 115])
+    print(stand.format_sweep(sweep, ["tent", "tilt", "width"]))
+    print(f"{len(sweep)} builds in {perf_counter() - start:.1f}s")
+
+# %%
+# Solver: the tent angle for a target height, without building. tests/test_stand.py
+# checks solved heights and footprints against the built halves.
+if __name__ == "__main__":
+    start = perf_counter()
+    tent = stand.tent_for_height(55, side=stand.left)
+    print(f"tent for 55mm: {tent:.3f} deg in {(perf_counter() - start) * 1000:.2f}ms")
@@ -1,193 +1,398 @@
 # %%
-from bd_utils.debug import add_show
-from ocp_vscode import *
+import math
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from functools import partial
+from itertools import product
+from multiprocessing import get_context
+from pathlib import Path
 
 import bd_utils as bdu
 from build123d import *
 
 # %%
-bdu.init_show()
-bdu.reset_camera()
-
-width = 115
-tent_angle = Vector(-3, -25)  # (tilt, tent)
-height_offset = 0  # otherwise rubber foot hits table
-bottom_expansion = 10
-length_ratio = 0.4
-
-wall_thickness = 14
-
-screw_hole_r = (7 / 2) + 0.1
-screw_hole_depth = 4.2
-
-fillet_r = 8
-bottom_chamfer = 10
-
-
-def build_left_half():
-    with BuildPart() as left_half:
-        length = 135 - 25
-
-        # profile
-        with BuildSketch(mode=Mode.PRIVATE) as sk_profile:
-            Rectangle(length, width, align=bdu.align2("--"))
-        sk_profile = sk_profile.sketch
-
-        # bottom
-        with BuildSketch() as sk_bottom:
-            add(sk_profile)
-            offset(amount=bottom_expansion, kind=Kind.INTERSECTION)
-            fillet(sk_bottom.vertices(), fillet_r)
-
-        # top
-        with BuildSketch(Rot(*tent_angle), mode=Mode.PRIVATE) as sk_top:
-            add(sk_profile)
-            fillet(sk_top.vertices(), fillet_r)
-        sk_top = sk_top.sketch
-        # offset top so lowest point is aligned with z=0
-        bbox = sk_top.faces()[0].bounding_box()
-        z_offset = abs(bbox.min.Z) + height_offset
-        sk_top.move(Location((0, 0, z_offset)))
-        add(sk_top)
-
-        # create the solid
-        loft()
-
-        # cut through
-        face_top = left_half.faces().sort_by(Axis.Z)[-1]
-        plane_top = Plane(
-            origin=(0, 0, z_offset),
-            x_dir=(1, 0, 0),
-            z_dir=face_top.normal_at(),
+if __name__ == "__main__":
+    bdu.init_show()
+    bdu.reset_camera()
+
+
+@dataclass(frozen=True)
+class StandParams:
+    width: float = 115
+    tilt: float = -3
+    tent: float = -25
+    """Tent of the left half. The right half is tented the other way."""
+    height_offset: float = 0  # otherwise rubber foot hits table
+    bottom_expansion: float = 10
+    length_ratio: float = 0.4
+
+    wall_thickness: float = 14
+
+    screw_hole_r: float = (7 / 2) + 0.1
+    screw_hole_depth: float = 4.2
+
+    fillet_r: float = 8
+    bottom_chamfer: float = 10
+
+    def tent_angle(self, side: "StandSide") -> Vector:
+        """Rotation of a half's top about X and Y."""
+        return Vector(self.tilt, self.tent * side.direction)
+
+
+@dataclass(frozen=True)
+class StandSide:
+    name: str
+    length: float
+    direction: int
+    """1 if the half extends toward +X from the split between the halves, else -1."""
+    screw_holes: tuple[tuple[float, float], ...]
+
+
+left = StandSide(
+    "left_half",
+    length=135 - 25,
+    direction=1,
+    screw_holes=((7.5 + 96, 7.4), (7.5 + 96 - 2, 7.4 + 23.5 + 55 + 22.5)),
+)
+right = StandSide(
+    "right_half",
+    length=154 - 25,
+    direction=-1,
+    screw_holes=((-(7.6 + 115), 7.4), (-(7.6 + 115) + 12, 7.4 + 23.5 + 59 + 18.5)),
+)
+sides = (left, right)
+
+_source = bdu.source_fingerprint(sys.modules[__name__])
+
+
+class StandHalf(BasePartObject):
+    def __init__(
+        self,
+        params: StandParams = StandParams(),
+        side: StandSide = left,
+        align: bdu.Align3Input | None = None,
+    ):
+        self.params = params
+        self.side = side
+
+        super().__init__(
+            bdu.cached_part(
+                self._build, type(self).__qualname__, params, side, _source
+            ),
+            align=bdu.align3(align),  # type: ignore
         )
-        with BuildSketch(plane_top) as sk_cut:
-            add(sk_profile)
-            offset(amount=-wall_thickness)
-            fillet(sk_cut.vertices(), fillet_r)
-        extrude(dir=(0, 0, -1), until=Until.LAST, mode=Mode.SUBTRACT)
-
-        # cut screw holes
-        with Locations(plane_top):
-            l1 = Vector(7.5 + 96, 7.4)
-            with Locations(
-                l1,
-                l1 + (-2, 23.5 + 55 + 22.5),
-            ) as locs:
-                Hole(screw_hole_r, screw_hole_depth)
-
-        # cut off left
-        split(bisect_by=Plane.YZ.offset(length * (1 - length_ratio)))
-
-        # cut scoop
-        with Locations(Pos((0, bbox.max.Y / 2 + 5, 5))) as locs:
-            Box(
-                length=200,
-                width=70,
-                height=100,
-                align=bdu.align3("-*-"),
-                mode=Mode.SUBTRACT,
+        self.label = side.name
+
+    @property
+    def tent_angle(self) -> Vector:
+        return self.params.tent_angle(self.side)
+
+    def _build(self) -> Part:
+        params, side = self.params, self.side
+        outward = "-" if side.direction > 0 else "+"
+
+        with BuildPart() as half:
+            # profile
+            with BuildSketch(mode=Mode.PRIVATE) as sk_profile:
+                Rectangle(side.length, params.width, align=bdu.align2(f"{outward}-"))
+            sk_profile = sk_profile.sketch
+
+            # bottom
+            with BuildSketch() as sk_bottom:
+                add(sk_profile)
+                offset(amount=params.bottom_expansion, kind=Kind.INTERSECTION)
+                fillet(sk_bottom.vertices(), params.fillet_r)
+
+            # top
+            with BuildSketch(Rot(*self.tent_angle), mode=Mode.PRIVATE) as sk_top:
+                add(sk_profile)
+                fillet(sk_top.vertices(), params.fillet_r)
+            sk_top = sk_top.sketch
+            # offset top so lowest point is aligned with z=0
+            bbox = sk_top.faces()[0].bounding_box()
+            z_offset = abs(bbox.min.Z) + params.height_offset
+            sk_top.move(Location((0, 0, z_offset)))
+            add(sk_top)
+
+            # create the solid
+            loft()
+
+            # cut through
+            face_top = bdu.fast_faces(half).sort_by(Axis.Z)[-1]
+            plane_top = Plane(
+                origin=(0, 0, z_offset),
+                x_dir=(1, 0, 0),
+                z_dir=face_top.normal_at(),
+            )
+            with BuildSketch(plane_top) as sk_cut:
+                add(sk_profile)
+                offset(amount=-params.wall_thickness)
+                fillet(sk_cut.vertices(), params.fillet_r)
+            extrude(dir=(0, 0, -1), until=Until.LAST, mode=Mode.SUBTRACT)
+
+            # cut screw holes
+            with Locations(plane_top):
+                with Locations(*side.screw_holes):
+                    Hole(params.screw_hole_r, params.screw_hole_depth)
+
+            # cut off the inner end
+            split(
+                bisect_by=Plane.YZ.offset(
+                    side.direction * side.length * (1 - params.length_ratio)
+                ),
+                keep=Keep.TOP if side.direction > 0 else Keep.BOTTOM,
             )
 
-        chamfer_edges = left_half.edges().filter_by(Axis.X).group_by(Axis.Z)[1]
-        chamfer(chamfer_edges, bottom_chamfer)  # type: ignore
-    left_half.part.label = "left_half"
-    return left_half.part
-
-
-def build_right_half():
-    with BuildPart() as right_half:
-        length = 154 - 25
-
-        # profile
-        with BuildSketch(mode=Mode.PRIVATE) as sk_profile:
-            Rectangle(length, width, align=bdu.align2("+-"))
-        sk_profile = sk_profile.sketch
-
-        # bottom
-        with BuildSketch() as sk_bottom:
-            add(sk_profile)
-            offset(amount=bottom_expansion, kind=Kind.INTERSECTION)
-            fillet(sk_bottom.vertices(), fillet_r)
-
-        # top
-        tent_angle.Y *= -1
-        with BuildSketch(Rot(*tent_angle), mode=Mode.PRIVATE) as sk_top:
-            add(sk_profile)
-            fillet(sk_top.vertices(), fillet_r)
-        sk_top = sk_top.sketch
-        # offset top so lowest point is aligned with z=0
-        bbox = sk_top.faces()[0].bounding_box()
-        z_offset = abs(bbox.min.Z) + height_offset
-        sk_top.move(Location((0, 0, z_offset)))
-        add(sk_top)
-
-        # create the solid
-        loft()
-
-        # cut through
-        face_top = right_half.faces().sort_by(Axis.Z)[-1]
-        plane_top = Plane(
-            origin=(0, 0, z_offset),
-            x_dir=(1, 0, 0),
-            z_dir=face_top.normal_at(),
-        )
-        with BuildSketch(plane_top) as sk_cut:
-            add(sk_profile)
-            offset(amount=-wall_thickness)
-            fillet(sk_cut.vertices(), fillet_r)
-        extrude(dir=(0, 0, -1), until=Until.LAST, mode=Mode.SUBTRACT)
-
-        # cut screw holes
-        with Locations(plane_top):
-            l1 = Vector(-(7.6 + 115), 7.4)
-            with Locations(
-                l1,
-                l1 + (12, 23.5 + 59 + 18.5),
-            ) as locs:
-                Hole(screw_hole_r, screw_hole_depth)
-
-        # cut off left
-        split(bisect_by=Plane.YZ.offset(-length * (1 - length_ratio)), keep=Keep.BOTTOM)
-
-        # cut scoop
-        with Locations(Pos((0, bbox.max.Y / 2 + 5, 5))) as locs:
-            Box(
-                length=200,
-                width=70,
-                height=100,
-                align=bdu.align3("+*-"),
-                mode=Mode.SUBTRACT,
+            # cut scoop
+            with Locations(Pos((0, bbox.max.Y / 2 + 5, 5))):
+                Box(
+                    length=200,
+                    width=70,
+                    height=100,
+                    align=bdu.align3(f"{outward}*-"),
+                    mode=Mode.SUBTRACT,
+                )
+
+            chamfer_edges = bdu.fast_edges(half).filter_by(Axis.X).group_by(Axis.Z)[1]
+            chamfer(chamfer_edges, params.bottom_chamfer)  # type: ignore
+
+        return half.part
+
+
+class Stand:
+    """Both halves of the stand, built from one set of parameters."""
+
+    def __init__(self, params: StandParams = StandParams()):
+        self.params = params
+
+    def build(self, workers: int | None = 1) -> dict[str, Part]:
+        """Build each half, in its own process if `workers` != 1.
+
+        Spawning a process costs a few seconds of imports, so this only pays
+        off when the halves take longer than that to build.
+        """
+        if workers == 1:
+            return {side.name: StandHalf(self.params, side) for side in sides}
+
+        with tempfile.TemporaryDirectory() as tmp_dir, ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),
+        ) as pool:
+            paths = pool.map(
+                _build_half_brep,
+                [self.params] * len(sides),
+                sides,
+                [Path(tmp_dir) / f"{side.name}.brep" for side in sides],
             )
+            return {
+                side.name: bdu.as_part(import_brep(str(path)))
+                for side, path in zip(sides, paths)
+            }
+
+
+@dataclass
+class HalfGeometry:
+    """Dimensions of a stand half, solved without building it."""
+
+    z_offset: float
+    """How far the tilted top is raised so its lowest point sits at z=0."""
+    height: float
+    """Height of the highest point left after the inner end is cut off."""
+    footprint: tuple[float, float, float, float]
+    """(min x, max x, min y, max y) of the face resting on the table."""
+
+
+def solve_half(
+    params: StandParams = StandParams(), side: StandSide = left
+) -> HalfGeometry:
+    """Height, z offset and footprint of a half, from its rotated top profile.
+
+    The top is the filleted profile rotated by `Rot(tilt, tent)`, which is a
+    rectangle grown by a disk of `fillet_r`. A linear function such as height
+    is extreme on it at a corner center pushed `fillet_r` along the gradient.
+    """
+    a = math.radians(params.tilt)
+    b = math.radians(params.tent * side.direction)
+    # Rot applies intrinsic XYZ angles, so the profile's (u, v) maps to
+    # x = cos(b) u and z = -cos(a) sin(b) u + sin(a) v
+    gradient = (-math.cos(a) * math.sin(b), math.sin(a))
+    norm = math.hypot(*gradient)
+
+    r = params.fillet_r
+    u_min = 0 if side.direction > 0 else -side.length
+    u_max = u_min + side.length
+    v_max = params.width
+    centers = [(u, v) for u in (u_min + r, u_max - r) for v in (r, v_max - r)]
+
+    def z(u: float, v: float) -> float:
+        return gradient[0] * u + gradient[1] * v
+
+    z_offset = abs(min(z(*c) for c in centers) - r * norm) + params.height_offset
+
+    # The cut is a plane of constant x, so a constant u in the profile
+    split = side.length * (1 - params.length_ratio)
+    u_split = side.direction * split / math.cos(b)
+
+    def is_kept(u: float) -> bool:
+        return side.direction * (u - u_split) >= -1e-9
+
+    candidates = []
+    for u, v in centers:
+        outward = (
+            1 if u > (u_min + u_max) / 2 else -1,
+            1 if v > v_max / 2 else -1,
+        )
+        # the gradient's extreme on this corner's arc, and where the arc ends
+        if norm > 0 and all(g * o >= 0 for g, o in zip(gradient, outward)):
+            candidates.append((u + r * gradient[0] / norm, v + r * gradient[1] / norm))
+        candidates += [(u + outward[0] * r, v), (u, v + outward[1] * r)]
+
+    # where the cut crosses the profile's outline
+    if u_min <= u_split <= u_max:
+        overhang = max(u_min + r - u_split, u_split - (u_max - r), 0)
+        inset = r - math.sqrt(max(r**2 - overhang**2, 0))
+        candidates += [(u_split, inset), (u_split, v_max - inset)]
+
+    kept = [z(u, v) for u, v in candidates if is_kept(u)]
+    if not kept:
+        raise ValueError(f"{side.name} is tented too far, the cut removes its top")
+    height = z_offset + max(kept)
+
+    e = params.bottom_expansion
+    x_range = sorted([side.direction * split, side.direction * (side.length + e)])
+    return HalfGeometry(z_offset, height, (*x_range, -e, v_max + e))
+
+
+def tent_for_height(
+    height: float,
+    params: StandParams = StandParams(),
+    side: StandSide = left,
+    tolerance: float = 1e-6,
+) -> float:
+    """The `tent` angle that raises a half to `height`, keeping the sign of
+    `params.tent`."""
+    sign = -1 if params.tent <= 0 else 1
+
+    def height_at(tent: float) -> float:
+        return solve_half(replace(params, tent=sign * tent), side).height
+
+    # past this angle the top no longer reaches the cut
+    low, high = 0.0, math.degrees(math.acos(1 - params.length_ratio))
+    if not height_at(low) <= height <= height_at(high):
+        raise ValueError(
+            f"{side.name} can't be {height}mm high, "
+            f"only {height_at(low):.2f} to {height_at(high):.2f}mm"
+        )
+
+    # height only grows with the tent angle, so bisect
+    while high - low > tolerance:
+        middle = (low + high) / 2
+        if height_at(middle) < height:
+            low = middle
+        else:
+            high = middle
+
+    return sign * (low + high) / 2
+
+
+@dataclass
+class SweepResult:
+    params: StandParams
+    side: str
+    height: float
+    volume: float
+
+
+def sweep(
+    base: StandParams = StandParams(),
+    workers: int | None = None,
+    **values: list[float],
+) -> list[SweepResult]:
+    """Build both halves for every combination of parameter `values`.
+
+    For example `sweep(tent=[-20, -25, -30], width=[110, 115])`.
+    """
+    names = list(values)
+    variants = [
+        replace(base, **dict(zip(names, combination)))
+        for combination in product(*values.values())
+    ]
+    jobs = [(params, side) for params in variants for side in sides]
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=get_context("spawn"),
+    ) as pool:
+        return list(pool.map(_measure_half, *zip(*jobs)))
+
+
+def format_sweep(results: list[SweepResult], names: list[str]) -> str:
+    """A table of the swept `names` with each half's height and volume."""
+    lines = [
+        " ".join(f"{name:>8}" for name in names)
+        + f" {'side':>10} {'height':>8} {'volume':>10}"
+    ]
+    for result in results:
+        lines.append(
+            " ".join(f"{getattr(result.params, name):8g}" for name in names)
+            + f" {result.side:>10} {result.height:8.2f} {result.volume:10.0f}"
+        )
+
+    return "\n".join(lines)
 
-        chamfer_edges = right_half.edges().filter_by(Axis.X).group_by(Axis.Z)[1]
-        chamfer(chamfer_edges, bottom_chamfer)  # type: ignore
-    right_half.part.label = "right_half"
-    return right_half.part
 
+def _build_half_brep(params: StandParams, side: StandSide, path: Path) -> Path:
+    StandHalf(params, side).export_brep(str(path))
+    return path
 
-left_half = build_left_half()
-right_half = build_right_half()
 
-bdu.add_show(left_half)
-bdu.add_show(right_half)
-bdu.show_selected()
+def _measure_half(params: StandParams, side: StandSide) -> SweepResult:
+    half = StandHalf(params, side)
+    return SweepResult(params, side.name, half.bounding_box().size.Z, half.volume)
 
-bbox = left_half.bounding_box()
-print("### Left half")
-print(f"Tent angle = {tent_angle}")
-print(f"Height = {bbox.size.Z}\n")
 
-bbox = right_half.bounding_box()
-print("### Right half")
-print(f"Tent angle = {tent_angle}")
-print(f"Height = {bbox.size.Z}\n")
+if __name__ == "__main__":
+    stand = Stand()
+    halves = stand.build()
+    left_half, right_half = halves["left_half"], halves["right_half"]
+
+    bdu.add_show(left_half)
+    bdu.add_show(right_half)
+    bdu.show_selected()
+
+    for side in sides:
+        print(f"### {side.name.replace('_', ' ').capitalize()}")
+        print(f"Tent angle = {stand.params.tent_angle(side)}")
+        print(f"Height = {halves[side.name].bounding_box().size.Z}\n")
 
 
 # %%
 ENABLE_EXPORT = False
 ENABLE_EXPORT = True
 
-if ENABLE_EXPORT:
-    left_half.export_step("export/uhk_stand_left_half.step")
-    right_half.export_step("export/uhk_stand_right_half.step")
-    print("EXPORTED")
+if __name__ == "__main__" and ENABLE_EXPORT:
+    # Only halves whose parameters or source changed are rewritten, from the
+    # halves built above rather than rebuilt
+    exports = bdu.export_parts(
+        [
+            bdu.ExportJob(
+                (f"uhk_stand_{side.name}.step",),
+                partial(halves.__getitem__, side.name),
+                (StandHalf.__qualname__, stand.params, side, _source),
+            )
+            for side in sides
+        ],
+        "export",
+    )
+    for export in exports:
+        print(f"{export.files[0]}: {export.status}")
+
+# %%
+# Sweep tent angles and widths, one build per process.
+ENABLE_SWEEP = False
+
+if __name__ == "__main__" and ENABLE_SWEEP:
+    results = sweep(tent=[-20, -25, -30], width=[110, 115])
+    print(format_sweep(results, ["tent", "width"]))
@@ -0,0 +1,33 @@
+from dataclasses import replace
+
+import pytest
+import stand
+
+
+@pytest.mark.parametrize("side", stand.sides, ids=lambda side: side.name)
+@pytest.mark.parametrize("tilt, tent", [(-8, -10), (-3, -25), (4, -40)])
+def test_solved_half_matches_build(tilt: float, tent: float, side: stand.StandSide):
+    params = replace(stand.StandParams(), tilt=tilt, tent=tent)
+    solved = stand.solve_half(params, side)
+    bbox = stand.StandHalf(params, side).bounding_box()
+
+    assert solved.height == pytest.approx(bbox.size.Z, abs=1e-3)
+    assert solved.footprint == pytest.approx(
+        (bbox.min.X, bbox.max.X, bbox.min.Y, bbox.max.Y), abs=1e-3
+    )
+
+
+@pytest.mark.parametrize("height", [45, 55])
+def test_tent_for_height_builds_that_height(height: float):
+    tent = stand.tent_for_height(height, side=stand.left)
+    params = replace(stand.StandParams(), tent=tent)
+
+    assert tent < 0
+    assert stand.StandHalf(params, stand.left).bounding_box().size.Z == pytest.approx(
+        height, abs=1e-3
+    )
+
+
+def test_tent_for_unreachable_height_fails():
+    with pytest.raises(ValueError, match="can't be"):
+        stand.tent_for_height(500, side=stand.left)